@@ -1,34 +1,46 @@
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from dash import dcc, html, Input, Output, Patch, dash_table
+from dash.exceptions import MissingCallbackContextException
 import dash_bootstrap_components as dbc
 from dash_bootstrap_templates import load_figure_template
 from bollinger_bands.data.fetcher import DataFetcher
-from bollinger_bands.indicators.moving_average import MovingAverage
 from bollinger_bands.indicators.bollinger_bands import BollingerBands
 from bollinger_bands.indicators.band_width import BandWidth
 from bollinger_bands.visualization.plotter import Plotter
 import datetime
+import functools
+import logging
+import sys
+from collections import namedtuple
 import pandas as pd
 from plotly.subplots import make_subplots
 import plotly.graph_objs as go
 import numpy as np
 
 # Import refactored modules
-from bollinger_bands.indicators.signals import detect_reentry_signals
+from bollinger_bands.indicators.signals import detect_reentry_signals, detect_candlestick_patterns
 from bollinger_bands.indicators.crossing_detection import (
     detect_price_crossing_down_daily,
     detect_price_crossing_down_period,
-    check_ma_conditions_for_period
+    ma_condition_share_in_windows,
+    ma_condition_share_by_period
 )
 from bollinger_bands.strategies.zones import identify_entry_zones_with_conditions
 from bollinger_bands.visualization.formatting import (
     format_quarter_labels_two_levels,
     format_monthly_labels_as_quarters,
-    format_daily_labels_simple
+    format_daily_labels_simple,
+    epoch_ms
 )
+from bollinger_bands.visualization.shading import build_fill_polygons
+from bollinger_bands.visualization.periods import resample_ohlc, resample_last
 from bollinger_bands.indicators.relative_strength import get_all_tickers_metrics
+from bollinger_bands.utils.runs import find_runs
+from bollinger_bands.utils.downsampling import m4_indices
 
 
+logger = logging.getLogger(__name__)
+
 # Tickers configuration
 tickers = ['EEM', 'URTH', 'GDX', 'GDXJ', 'LTAM.L', 'IBB', 'XBI', 'IOGP.L', 'WENS.AS']
 tickers_dict = {
@@ -44,25 +56,324 @@ tickers_dict = {
 }
 
 ticker_data = {}
-fetcher = DataFetcher()
+# Downloaded data is kept on disk as parquet (needs pyarrow) and refreshed daily
+fetcher = DataFetcher(cache_dir='.cache')
 start_date = '2015-01-01'
 now = datetime.datetime.now()
 end_date = now.strftime('%Y-%m-%d')
 
+
+def clean_price_data(data):
+    """Drop missing values, invalid dates and history before 2000 in one pass, sorted by date"""
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    valid = data.notna().all(axis=1).to_numpy() & data.index.notnull() & (data.index >= '2000-01-01')
+    return data[valid]
+
+
+def build_display_data(data):
+    """Daily, monthly and quarterly candles of cleaned daily data, limited to its date range"""
+    display = {'daily': data[['Open','High','Low','Close']]}
+    for period in ['monthly', 'quarterly']:
+        display_data = resample_ohlc(data, period).dropna()
+        display_data = display_data[display_data.index.notnull()]
+        display_data = display_data.loc['2000-01-01':data.index[-1]]
+        display[period] = display_data
+    return display
+
+
+Indicators = namedtuple('Indicators', [
+    'ma_long_values', 'ma_long_change', 'ma_short_values', 'ma_short_change',
+    'bb_long_values', 'bb_short_values', 'bandwidth_long', 'bandwidth_mean', 'is_below_ma'
+])
+
+
+# Buckets the daily lower subplot lines are downsampled to: about one per two to three pixels
+# of plot width, so the ~2900 trading days since 2015 already go through the M4 reduction
+line_buckets = 500
+
+
+# MA/BB windows (long, short) in trading days and label of each MA period option
+ma_presets = {
+    '40m20m': (840, 420, "40M/20M"),
+    '20m10m': (420, 210, "20M/10M"),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def compute_indicators(ticker, long_window, short_window):
+    """MA, Bollinger Band and Band Width values on the cleaned daily data of a ticker.
+    
+    Cached per (ticker, long_window, short_window) since ticker data does not change
+    after startup; callers must not modify the returned series.
+    """
+    data = ticker_data[ticker]
+    
+    # Both band pairs in one pass over the close prices
+    bb = BollingerBands(num_std=2)
+    bb_values = bb.calculate_multi(data, [long_window, short_window])
+    bb_long_values = bb_values[long_window]
+    bb_short_values = bb_values[short_window]
+    
+    # The middle bands are the moving averages of the same windows, no second rolling mean needed
+    ma_long_values = bb_long_values['middle']
+    ma_long_change = ma_long_values.pct_change() * 100
+    
+    ma_short_values = bb_short_values['middle']
+    ma_short_change = ma_short_values.pct_change() * 100
+    
+    bw = BandWidth(window=long_window)
+    bandwidth_long = bw.calculate(bb_long_values)
+    bandwidth_mean = bandwidth_long.mean()
+    
+    # Shared by the re-entry signals, the entry zones and the below-MA shading
+    is_below_ma = (data['Close'] < ma_long_values).to_numpy()
+    
+    return Indicators(ma_long_values, ma_long_change, ma_short_values, ma_short_change,
+                      bb_long_values, bb_short_values, bandwidth_long, bandwidth_mean, is_below_ma)
+
+
+@functools.lru_cache(maxsize=64)
+def lower_panel_series(ticker, period, long_window, short_window):
+    """BandWidth and MA change series of the lower subplots.
+    
+    Aggregated views only need one point per candle, so the daily series are
+    reduced to the last value of each month or quarter. Daily series longer
+    than 4 * line_buckets points are M4 downsampled.
+    """
+    indicators = compute_indicators(ticker, long_window, short_window)
+    series = (indicators.bandwidth_long, indicators.ma_long_change, indicators.ma_short_change)
+    if period in ['monthly', 'quarterly']:
+        # Same centered dates as the candles above
+        series = tuple(resample_last(values, period) for values in series)
+    else:
+        # Long daily lines only keep the M4 points (first, last, min, max) of about one bucket per pixel
+        series = tuple(values.iloc[m4_indices(values, line_buckets)] for values in series)
+    return series
+
+
+def display_range(index, display_data):
+    """Positional bounds of the display candles' date range in a sorted daily index"""
+    start, end = display_data.index[0], display_data.index[-1]
+    return index.searchsorted(start, side='left'), index.searchsorted(end, side='right')
+
+
+@functools.lru_cache(maxsize=32)
+def price_chart_traces(ticker, period, long_window, short_window, long_name, short_name):
+    """Candlestick, MA and Bollinger Band traces of the price subplot.
+    
+    They do not depend on thresholds or display options, so they are cached per
+    ticker, display period and MA windows; callers must not modify the traces.
+    """
+    display_data = ticker_display[ticker][period]
+    indicators = compute_indicators(ticker, long_window, short_window)
+    
+    # All indicator series share the sorted daily index, so one positional range fits them all
+    lo, hi = display_range(indicators.ma_long_values.index, display_data)
+    
+    plotter = Plotter()
+    plotter.plot_candlestick(display_data, name=ticker)
+    plotter.add_moving_average(indicators.ma_long_values.iloc[lo:hi])
+    plotter.add_bollinger_bands({key: values.iloc[lo:hi] for key, values in indicators.bb_long_values.items()},
+                                name_prefix=f'BB {long_name}', dashed=False)
+    plotter.add_bollinger_bands({key: values.iloc[lo:hi] for key, values in indicators.bb_short_values.items()},
+                                name_prefix=f'BB {short_name}', dashed=True)
+    return tuple(plotter.fig.data)
+
+
+@functools.lru_cache(maxsize=32)
+def period_end_positions(ticker, period):
+    """Positions in the daily data nearest to the end date of each display candle.
+    
+    Cached per (ticker, period); the daily indicator series share the daily data index,
+    so their values at the period ends can be gathered with these positions.
+    """
+    display_data = ticker_display[ticker][period if period in ['monthly', 'quarterly'] else 'daily']
+    if 'original_date' in display_data.columns:
+        period_end_dates = display_data['original_date']
+    else:
+        period_end_dates = display_data.index
+    return ticker_data[ticker].index.get_indexer(period_end_dates, method='nearest')
+
+
+Signals = namedtuple('Signals', ['reentry_signals', 'combined_ma_condition', 'price_crossing', 'entry_zones'])
+
+
+@functools.lru_cache(maxsize=64)
+def compute_signals(ticker, period, long_window, short_window, flat_threshold_840, flat_threshold_420,
+                    enabled_signals, bb_distance_threshold, smoothing_window, ma_condition_threshold, daily_lookahead):
+    """Re-entry signals, MA conditions, price crossings and entry zones of a ticker.
+    
+    Cached per combination of the inputs they depend on, so changing the scale or the
+    displayed zones only rebuilds the figure. enabled_signals must be a tuple; callers
+    must not modify the returned values.
+    """
+    data = ticker_data[ticker]
+    display_data = ticker_display[ticker][period if period in ['monthly', 'quarterly'] else 'daily']
+    indicators = compute_indicators(ticker, long_window, short_window)
+    ma_long_values, ma_long_change, ma_short_change = indicators.ma_long_values, indicators.ma_long_change, indicators.ma_short_change
+    bb_long_values, is_below_ma = indicators.bb_long_values, indicators.is_below_ma
+    
+    # Detect re-entry signals using refactored module
+    reentry_signals = detect_reentry_signals(
+        data, ma_long_values, bb_long_values, 
+        enabled_signals, bb_distance_threshold,
+        patterns=ticker_patterns[ticker], is_below_ma=is_below_ma
+    )
+    
+    # Calculate MA conditions
+    # Only used positionally (cumulative sums, run bounds), so keep it as a boolean array
+    flat_long = ma_long_change.to_numpy() < flat_threshold_840
+    decreasing_short = ma_short_change.to_numpy() < flat_threshold_420
+    combined_ma_condition = flat_long & decreasing_short
+    
+    # Exit conditions - detect price crossings
+    if period == 'daily':
+        price_crossing = detect_price_crossing_down_daily(
+            display_data, ma_long_values, smoothing_window=smoothing_window
+        )
+        
+        # Apply MA condition threshold if lookahead > 0: share of days with MA conditions
+        # in the lookahead window after each crossing, all crossings at once
+        # (a threshold of 0 keeps every crossing, so the check is skipped)
+        if daily_lookahead > 0 and ma_condition_threshold > 0 and price_crossing.sum() > 0:
+            crossing_mask = (price_crossing == 1).to_numpy()
+            crossing_dates = display_data.index[crossing_mask]
+            condition_share, total_days = ma_condition_share_in_windows(
+                data.index, combined_ma_condition, crossing_dates,
+                crossing_dates + pd.Timedelta(days=daily_lookahead)
+            )
+            
+            # Crossings without data in the window are kept
+            valid = (total_days == 0) | (condition_share >= ma_condition_threshold)
+            valid_crossings = np.zeros(len(display_data), dtype=np.int8)
+            valid_crossings[np.flatnonzero(crossing_mask)[valid]] = 1
+            price_crossing = pd.Series(valid_crossings, index=display_data.index)
+    else:
+        # MA value at the end of each period (only needed for aggregated views)
+        ma_at_period_dates = pd.Series(ma_long_values.to_numpy()[period_end_positions(ticker, period)],
+                                       index=display_data.index)
+        
+        price_crossing = detect_price_crossing_down_period(display_data, ma_at_period_dates)
+    
+    # For monthly/quarterly: filter crossings by MA conditions (none are removed with a threshold of 0)
+    if period in ['monthly', 'quarterly'] and ma_condition_threshold > 0 and price_crossing.sum() > 0:
+        crossing_positions = np.flatnonzero((price_crossing == 1).to_numpy())
+        if 'original_date' in display_data.columns:
+            original_cross_dates = pd.DatetimeIndex(display_data['original_date'].to_numpy()[crossing_positions])
+        else:
+            original_cross_dates = display_data.index[crossing_positions]
+        
+        # Share of days with MA conditions in each crossing's period, from one pass over the daily data
+        condition_share = ma_condition_share_by_period(
+            data.index, combined_ma_condition, period, dates=original_cross_dates
+        )
+        
+        valid_crossings = np.zeros(len(display_data), dtype=np.int8)
+        valid_crossings[crossing_positions[condition_share >= ma_condition_threshold]] = 1
+        
+        price_crossing = pd.Series(valid_crossings, index=display_data.index)
+    
+    # Identify entry zones
+    entry_zones = identify_entry_zones_with_conditions(
+        data, display_data, ma_long_values, reentry_signals, 
+        price_crossing, combined_ma_condition,
+        ma_condition_threshold=ma_condition_threshold, period=period, is_below=is_below_ma
+    )
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Total entry zones found: %d", len(entry_zones))
+        for i, zone in enumerate(entry_zones[:3]):
+            logger.debug("  Zone %d: %s to %s, completed=%s", i + 1, zone['start'].date(), zone['end'].date(), zone['completed'])
+    
+    return Signals(reentry_signals, combined_ma_condition, price_crossing, entry_zones)
+
+
 print("Fetching data...")
+# Cache hits are read from disk, all other tickers are fetched with a single download
+loaded = fetcher.fetch_ohlc_data_batch(tickers, start_date, end_date)
 for ticker in tickers:
+    data = loaded[ticker]
     print(ticker)
-    data = fetcher.fetch_ohlc_data(ticker, start_date, end_date)
     data.attrs['ticker'] = ticker
-    ticker_data[ticker] = data
+    # Prices do not need double precision; float32 halves the memory the indicators stream through
+    # Data is validated once here, so callbacks can use it as is
+    ticker_data[ticker] = clean_price_data(data.astype(np.float32))
 print("Data loaded!")
 
+# Candlestick patterns and display candles only depend on the OHLC data - build them once per ticker
+ticker_patterns = {}
+ticker_display = {}
+for ticker, data in ticker_data.items():
+    ticker_patterns[ticker] = detect_candlestick_patterns(data)
+    ticker_display[ticker] = build_display_data(data)
+
+# Indicators only depend on the ticker and the MA/BB windows - compute them for every preset up front
+for ticker in ticker_data:
+    for long_window, short_window, _ in ma_presets.values():
+        compute_indicators(ticker, long_window, short_window)
+
 app = dash.Dash(__name__, external_stylesheets=[
     dbc.themes.LUX,
     "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css"
 ])
 load_figure_template("LUX")
 
+
+def build_base_figure():
+    """Three-row chart without data, holding the layout shared by every update.
+    
+    Built once at startup; callbacks copy it and only set the titles, traces and shapes.
+    """
+    fig = make_subplots(
+        rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.1, 
+        row_heights=[0.6, 0.2, 0.2],
+        subplot_titles=("Price", "Band Width", "Exit Signals: MA Change & Price Crossing"),
+        specs=[[{"secondary_y": False}], [{"secondary_y": False}], [{"secondary_y": False}]]
+    )
+    
+    fig.update_layout(
+        height=1200, 
+        showlegend=True, 
+        hovermode='closest',
+        legend=dict(
+            orientation="h", 
+            yanchor="bottom", 
+            y=1.05,
+            xanchor="left", 
+            x=0, 
+            bgcolor="rgba(255,255,255,0.8)", 
+            bordercolor="lightgray", 
+            borderwidth=1
+        ),
+        xaxis=dict(
+            rangeselector=dict(
+                buttons=[
+                    dict(count=1, label="1m", step="month", stepmode="backward"),
+                    dict(count=6, label="6m", step="month", stepmode="backward"), 
+                    dict(count=1, label="1y", step="year", stepmode="backward"),
+                    dict(step="all", label="All")
+                ], 
+                y=1.18,
+                yanchor="top"
+            )
+        )
+    )
+    
+    # Line and candle x values are epoch milliseconds, which only date axes read as dates
+    fig.update_xaxes(type='date')
+    fig.update_xaxes(row=1, col=1, rangeslider_visible=False, showticklabels=True)
+    fig.update_xaxes(row=2, col=1, rangeslider_visible=False, showticklabels=True)
+    fig.update_xaxes(title_text="Date", row=3, col=1, rangeslider_visible=True, showticklabels=True)
+    
+    fig.update_yaxes(title_text="Price", autorange=True, row=1, col=1)
+    fig.update_yaxes(title_text="Band Width", row=2, col=1)
+    fig.update_yaxes(title_text="MA Change (%)", row=3, col=1)
+    return fig
+
+
+base_figure = build_base_figure()
+
 app.layout = dbc.Container([
     html.H1("Stock Chart with Bollinger Bands & Trading Signals", style={'textAlign': 'center'}),
     html.H2(id='ticker-name', style={'textAlign': 'center'}),
@@ -261,10 +572,10 @@ app.layout = dbc.Container([
             ),
         ], width=12),
     ], className="mb-4"),
-
+    
     # Store for target date (hidden)
     dcc.Store(id='target-date-store'),
-
+    
     # Main chart with bottom margin to separate from content below
     dcc.Graph(id='stock-chart', style={'height': '120vh', 'marginBottom': '5rem'}),
     
@@ -318,8 +629,7 @@ def update_target_date(relayout_data):
     if relayout_data is None:
         return None
     
-    # Debug: print what we're receiving
-    print(f"DEBUG relayoutData keys: {relayout_data.keys()}")
+    logger.debug("relayoutData keys: %s", list(relayout_data.keys()))
     
     # Check for range changes from slider or zoom/pan
     # These are the different ways the range can be updated:
@@ -327,24 +637,24 @@ def update_target_date(relayout_data):
     # Method 1: Direct xaxis.range update (from slider)
     if 'xaxis.range[1]' in relayout_data:
         target_date = relayout_data['xaxis.range[1]']
-        print(f"DEBUG: Range from xaxis.range[1]: {target_date}")
+        logger.debug("Range from xaxis.range[1]: %s", target_date)
         return target_date
     
     # Method 2: xaxis.range as array (from zoom/pan)
     if 'xaxis.range' in relayout_data and len(relayout_data['xaxis.range']) > 1:
         target_date = relayout_data['xaxis.range'][1]
-        print(f"DEBUG: Range from xaxis.range: {target_date}")
+        logger.debug("Range from xaxis.range: %s", target_date)
         return target_date
     
     # Method 3: Check for xaxis3.range (bottom subplot with rangeslider)
     if 'xaxis3.range[1]' in relayout_data:
         target_date = relayout_data['xaxis3.range[1]']
-        print(f"DEBUG: Range from xaxis3.range[1]: {target_date}")
+        logger.debug("Range from xaxis3.range[1]: %s", target_date)
         return target_date
     
     if 'xaxis3.range' in relayout_data and len(relayout_data['xaxis3.range']) > 1:
         target_date = relayout_data['xaxis3.range'][1]
-        print(f"DEBUG: Range from xaxis3.range: {target_date}")
+        logger.debug("Range from xaxis3.range: %s", target_date)
         return target_date
     
     # Method 4: Check for autosize or other layout changes
@@ -352,7 +662,7 @@ def update_target_date(relayout_data):
         # Layout resize - don't update date
         return None
     
-    print(f"DEBUG: No range found in relayoutData")
+    logger.debug("No range found in relayoutData")
     return None
 
 
@@ -463,6 +773,14 @@ def update_relative_strength_table(selected_ticker, filter_value, target_date):
     ])
 
 
+def triggered_input():
+    """Id of the input that triggered the running callback (None on the initial call or outside a callback)"""
+    try:
+        return dash.ctx.triggered_id
+    except MissingCallbackContextException:
+        return None
+
+
 @app.callback(
     [Output('stock-chart', 'figure'), Output('ticker-name', 'children')],
     [Input('ticker-dropdown', 'value'), Input('period-selector', 'value'),
@@ -475,19 +793,19 @@ def update_relative_strength_table(selected_ticker, filter_value, target_date):
 def update_chart(selected_ticker, period, ma_period, scale, flat_threshold_840, flat_threshold_420, 
                 enabled_signals, bb_distance_threshold, display_zones, smoothing_window, 
                 ma_condition_threshold, daily_lookahead):
+    # Only the scale changed: patch the y-axis type of the figure in the browser instead of resending it
+    if triggered_input() == 'scale-selector':
+        patched_figure = Patch()
+        patched_figure['layout']['yaxis']['type'] = 'log' if scale == 'log' else 'linear'
+        return patched_figure, dash.no_update
+    
     try:
         data = ticker_data[selected_ticker]
         if 'ticker' not in data.attrs:
             data.attrs['ticker'] = selected_ticker
         
-        # CRITICAL: Clean the data at the very beginning
-        data = data.dropna()
-        data = data[data.index.notnull()]
-        data = data[data.index >= '2000-01-01']
-        
-        print(f"=== RAW DATA AFTER CLEANING ===")
-        print(f"Data shape: {data.shape}")
-        print(f"Data range: {data.index[0]} to {data.index[-1]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Data shape: %s, range: %s to %s", data.shape, data.index[0], data.index[-1])
         
         # Defaults
         if flat_threshold_840 is None:
@@ -504,285 +822,139 @@ def update_chart(selected_ticker, period, ma_period, scale, flat_threshold_840,
         daily_lookahead = daily_lookahead if daily_lookahead is not None else 10
         
         # MA/BB windows
-        if ma_period == '20m10m':
-            long_window, short_window, period_label = 420, 210, "20M/10M"
-        else:
-            long_window, short_window, period_label = 840, 420, "40M/20M"
-        
-        # Resample price data
-        if period == 'quarterly':
-            display_data = data.resample('QE').agg({'Open':'first','High':'max','Low':'min','Close':'last'}).dropna()
-            display_label = "Quarterly"
-            display_data['original_date'] = display_data.index
-            display_data.index = display_data.index - pd.Timedelta(days=45)
-        elif period == 'monthly':
-            display_data = data.resample('ME').agg({'Open':'first','High':'max','Low':'min','Close':'last'}).dropna()
-            display_label = "Monthly"
-            display_data['original_date'] = display_data.index
-            display_data.index = display_data.index - pd.Timedelta(days=15)
-        else:
-            display_data = data[['Open','High','Low','Close']].copy()
-            display_label = "Daily"
-        
-        # Clean display data
-        display_data = display_data.dropna()
-        display_data = display_data[display_data.index.notnull()]
-        display_data = display_data[display_data.index <= data.index[-1]]
-        display_data = display_data[display_data.index >= '2000-01-01']
-        
-        # Calculate indicators on daily data
-        ma_long = MovingAverage(window=long_window)
-        ma_long_values = ma_long.calculate(data)
-        ma_long_change = ma_long.calculate_change(data)
-        
-        ma_short = MovingAverage(window=short_window)
-        ma_short_values = ma_short.calculate(data)
-        ma_short_change = ma_short.calculate_change(data)
-        
-        bb_long = BollingerBands(window=long_window, num_std=2)
-        bb_long_values = bb_long.calculate(data)
-        
-        bb_short = BollingerBands(window=short_window, num_std=2)
-        bb_short_values = bb_short.calculate(data)
-        
-        bw = BandWidth(window=long_window)
-        bandwidth_long = bw.calculate(bb_long_values)
-        
-        # Filter to display range
-        start, end = display_data.index[0], display_data.index[-1]
-        
-        ma_long_filt = ma_long_values[(ma_long_values.index >= start) & (ma_long_values.index <= end)]
+        long_window, short_window, period_label = ma_presets.get(ma_period, ma_presets['40m20m'])
+        long_name, short_name = period_label.split('/')
         
-        bb_long_filt = {
-            'upper': bb_long_values['upper'][(bb_long_values['upper'].index >= start) & (bb_long_values['upper'].index <= end)],
-            'middle': bb_long_values['middle'][(bb_long_values['middle'].index >= start) & (bb_long_values['middle'].index <= end)],
-            'lower': bb_long_values['lower'][(bb_long_values['lower'].index >= start) & (bb_long_values['lower'].index <= end)]
-        }
+        # Display candles (cleaned and resampled at startup)
+        display_period = period if period in ['monthly', 'quarterly'] else 'daily'
+        display_data = ticker_display[selected_ticker][display_period]
+        display_label = display_period.capitalize()
         
-        bb_short_filt = {
-            'upper': bb_short_values['upper'][(bb_short_values['upper'].index >= start) & (bb_short_values['upper'].index <= end)],
-            'middle': bb_short_values['middle'][(bb_short_values['middle'].index >= start) & (bb_short_values['middle'].index <= end)],
-            'lower': bb_short_values['lower'][(bb_short_values['lower'].index >= start) & (bb_short_values['lower'].index <= end)]
-        }
+        # Indicators on daily data (cached per ticker and window pair)
+        indicators = compute_indicators(selected_ticker, long_window, short_window)
+        bb_long_values = indicators.bb_long_values
+        bandwidth_mean = indicators.bandwidth_mean
+        is_below_ma = indicators.is_below_ma
         
-        # Detect re-entry signals using refactored module
-        reentry_signals = detect_reentry_signals(
-            data, ma_long_values, bb_long_values, 
-            enabled_signals, bb_distance_threshold
+        # Signals, crossings and zones (cached per combination of the inputs they depend on)
+        reentry_signals, combined_ma_condition, price_crossing, entry_zones = compute_signals(
+            selected_ticker, period, long_window, short_window, flat_threshold_840, flat_threshold_420,
+            tuple(sorted(enabled_signals)), bb_distance_threshold, smoothing_window,
+            ma_condition_threshold, daily_lookahead
         )
         
-        # Calculate MA conditions
-        flat_long = ma_long_change < flat_threshold_840
-        decreasing_short = ma_short_change < flat_threshold_420
-        combined_ma_condition = flat_long & decreasing_short
-        
-        # Exit conditions - detect price crossings
-        if period in ['monthly', 'quarterly'] and 'original_date' in display_data.columns:
-            period_end_dates = display_data['original_date']
-        else:
-            period_end_dates = display_data.index
-            
-        ma_at_period_dates = ma_long_values.reindex(period_end_dates, method='nearest')
-        ma_at_period_dates.index = display_data.index
-        
-        if period == 'daily':
-            price_crossing = detect_price_crossing_down_daily(
-                display_data, ma_long_values, smoothing_window=smoothing_window
-            )
-            
-            # Apply MA condition threshold if lookahead > 0
-            if daily_lookahead > 0 and price_crossing.sum() > 0:
-                crossing_dates = display_data.index[price_crossing == 1]
-                valid_crossings = pd.Series(0, index=display_data.index, dtype=float)
-                
-                for cross_date in crossing_dates:
-                    lookahead_end = cross_date + pd.Timedelta(days=daily_lookahead)
-                    
-                    conditions_met, pct, days_met, total_days = check_ma_conditions_for_period(
-                        lookahead_end, cross_date, data, combined_ma_condition, 
-                        threshold=ma_condition_threshold
-                    )
-                    
-                    if total_days > 0 and conditions_met:
-                        valid_crossings.loc[cross_date] = 1
-                    elif total_days == 0:
-                        valid_crossings.loc[cross_date] = 1
-                
-                price_crossing = valid_crossings
-        else:
-            price_crossing = detect_price_crossing_down_period(display_data, ma_at_period_dates)
-        
-        # For monthly/quarterly: filter crossings by MA conditions
-        if period in ['monthly', 'quarterly'] and price_crossing.sum() > 0:
-            crossing_dates = display_data.index[price_crossing == 1]
-            valid_crossings = pd.Series(0, index=display_data.index, dtype=float)
-            
-            for cross_date in crossing_dates:
-                if 'original_date' in display_data.columns:
-                    original_cross_date = display_data.loc[cross_date, 'original_date']
-                else:
-                    original_cross_date = cross_date
-                
-                if period == 'quarterly':
-                    period_start = pd.Timestamp(original_cross_date.year, ((original_cross_date.month - 1) // 3) * 3 + 1, 1)
-                else:
-                    period_start = pd.Timestamp(original_cross_date.year, original_cross_date.month, 1)
-                
-                conditions_met, pct, days_met, total_days = check_ma_conditions_for_period(
-                    original_cross_date, period_start, data, combined_ma_condition, 
-                    threshold=ma_condition_threshold
-                )
-                
-                if conditions_met:
-                    valid_crossings.loc[cross_date] = 1
-            
-            price_crossing = valid_crossings
-        
-        # Identify entry zones
-        entry_zones = identify_entry_zones_with_conditions(
-            data, display_data, ma_long_values, reentry_signals, 
-            price_crossing, combined_ma_condition,
-            ma_condition_threshold=ma_condition_threshold, period=period
-        )
-        
-        print(f"DEBUG: Total entry zones found: {len(entry_zones)}")
-        if len(entry_zones) > 0:
-            for i, zone in enumerate(entry_zones[:3]):
-                print(f"  Zone {i+1}: {zone['start'].date()} to {zone['end'].date()}, completed={zone['completed']}")
-        
-        # Plot
-        plotter = Plotter()
-        fig = plotter.plot_candlestick(display_data, name=selected_ticker)
-        
-        plotter.add_moving_average(ma_long_filt)
-        plotter.add_bollinger_bands(bb_long_filt, name_prefix=f'BB {period_label.split("/")[0]}', dashed=False)
-        plotter.add_bollinger_bands(bb_short_filt, name_prefix=f'BB {period_label.split("/")[1]}', dashed=True)
-        
         ticker_name = tickers_dict.get(selected_ticker, selected_ticker)
-        long_name, short_name = period_label.split('/')
         
-        # Create subplots
-        fig_with_bandwidth = make_subplots(
-            rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.1, 
-            row_heights=[0.6, 0.2, 0.2],
-            subplot_titles=(
-                f"{ticker_name} ({display_label} Candles, {period_label} MA/BB)", 
-                f"Band Width ({long_name} BB)", 
-                "Exit Signals: MA Change & Price Crossing"
-            ),
-            specs=[[{"secondary_y": False}], [{"secondary_y": False}], [{"secondary_y": False}]]
-        )
+        # Copy of the prebuilt subplot grid and static layout, only the titles depend on the inputs
+        fig_with_bandwidth = go.Figure(base_figure)
+        fig_with_bandwidth.layout.annotations[0].text = f"{ticker_name} ({display_label} Candles, {period_label} MA/BB)"
+        fig_with_bandwidth.layout.annotations[1].text = f"Band Width ({long_name} BB)"
         
-        for trace in plotter.fig.data:
-            fig_with_bandwidth.add_trace(trace, row=1, col=1)
+        # Traces of all subplots are collected with their rows and added in one call
+        # Price traces (cached per ticker, display period and MA windows)
+        traces = list(price_chart_traces(selected_ticker, display_period, long_window, short_window, long_name, short_name))
+        trace_rows = [1] * len(traces)
         
         # Add zones
-        y_min = max(0, bb_long_filt['lower'].min() * 0.9) if len(bb_long_filt['lower']) > 0 else 0
+        lo, hi = display_range(bb_long_values['lower'].index, display_data)
+        bb_long_lower = bb_long_values['lower'].iloc[lo:hi]
+        y_min = max(0, bb_long_lower.min() * 0.9) if len(bb_long_lower) > 0 else 0
         
-        for zone in entry_zones:
-            zone_data = data.loc[zone['start']:zone['end']]
-            
-            if zone['completed'] and 'complete_zone' in display_zones:
-                fig_with_bandwidth.add_trace(
-                    go.Scatter(x=zone_data.index, y=[y_min]*len(zone_data), mode='lines', 
-                              line=dict(width=0), showlegend=False, hoverinfo='skip'), 
-                    row=1, col=1
-                )
-                fig_with_bandwidth.add_trace(
-                    go.Scatter(x=zone_data.index, y=zone_data['Close'], mode='lines', 
-                              fill='tonexty', fillcolor='rgba(100,200,100,0.3)', 
-                              line=dict(width=0), name='Complete Zone', showlegend=False, 
-                              hoverinfo='skip'), 
-                    row=1, col=1
-                )
-            elif not zone['completed'] and 'incomplete_zone' in display_zones:
-                fig_with_bandwidth.add_trace(
-                    go.Scatter(x=zone_data.index, y=[y_min]*len(zone_data), mode='lines', 
-                              line=dict(width=0), showlegend=False, hoverinfo='skip'), 
-                    row=1, col=1
-                )
-                fig_with_bandwidth.add_trace(
-                    go.Scatter(x=zone_data.index, y=zone_data['Close'], mode='lines', 
-                              fill='tonexty', fillcolor='rgba(255,200,100,0.3)', 
-                              line=dict(width=0), name='Incomplete Zone', showlegend=False, 
-                              hoverinfo='skip'), 
-                    row=1, col=1
-                )
+        # One gap-separated fill trace per zone type instead of two traces per zone
+        zone_styles = [
+            ('complete_zone', True, 'rgba(100,200,100,0.3)', 'Complete Zone'),
+            ('incomplete_zone', False, 'rgba(255,200,100,0.3)', 'Incomplete Zone')
+        ]
+        for zone_type, completed, fillcolor, zone_name in zone_styles:
+            zones = [zone for zone in entry_zones if zone['completed'] == completed]
+            if zone_type not in display_zones or not zones:
+                continue
+            starts = [zone['start_pos'] for zone in zones]
+            ends = [zone['end_pos'] + 1 for zone in zones]
+            xs, ys = build_fill_polygons(data.index, data['Close'], y_min, starts, ends)
+            traces.append(
+                go.Scatter(x=xs, y=ys, mode='lines',
+                          fill='toself', fillcolor=fillcolor, 
+                          line=dict(width=0), name=zone_name, showlegend=False, 
+                          hoverinfo='skip')
+            )
+            trace_rows.append(1)
         
         if 'below_ma' in display_zones:
-            is_below = data['Close'] < ma_long_values
-            segment_id = (is_below != is_below.shift(1)).cumsum().fillna(0)
-            segments_df = pd.DataFrame({'Close': data['Close'], 'is_below': is_below, 'segment': segment_id})
-            for name, group in segments_df.groupby('segment'):
-                if len(group) >= 2 and group['is_below'].mean() > 0.5:
-                    fig_with_bandwidth.add_trace(
-                        go.Scatter(x=group.index, y=[y_min]*len(group), mode='lines', 
-                                  line=dict(width=0), showlegend=False, hoverinfo='skip'), 
-                        row=1, col=1
-                    )
-                    fig_with_bandwidth.add_trace(
-                        go.Scatter(x=group.index, y=group['Close'], mode='lines', 
-                                  fill='tonexty', fillcolor='rgba(255,0,0,0.2)', 
-                                  line=dict(width=0), showlegend=False, hoverinfo='skip'), 
-                        row=1, col=1
-                    )
+            # All below-MA periods of at least 2 days as one gap-separated fill trace
+            starts, ends = find_runs(is_below_ma)
+            long_runs = (ends - starts) >= 2
+            if long_runs.any():
+                xs, ys = build_fill_polygons(data.index, data['Close'], y_min, starts[long_runs], ends[long_runs])
+                traces.append(
+                    go.Scatter(x=xs, y=ys, mode='lines',
+                              fill='toself', fillcolor='rgba(255,0,0,0.2)', 
+                              line=dict(width=0), showlegend=False, hoverinfo='skip')
+                )
+                trace_rows.append(1)
         
         # Re-entry signals
-        reentry_dates = data.index[reentry_signals]
-        reentry_prices = data.loc[reentry_signals, 'Low'] * 0.98
+        reentry_positions = np.flatnonzero(reentry_signals.to_numpy())
+        reentry_dates = data.index[reentry_positions]
+        reentry_prices = data['Low'].to_numpy()[reentry_positions] * 0.98
         if len(reentry_dates) > 0:
-            fig_with_bandwidth.add_trace(
+            traces.append(
                 go.Scatter(x=reentry_dates, y=reentry_prices, mode='markers',
                           marker=dict(symbol='triangle-up', size=12, color='green', 
                                      line=dict(color='darkgreen', width=1)),
-                          name='Re-Entry Signal'), 
-                row=1, col=1
+                          name='Re-Entry Signal')
             )
+            trace_rows.append(1)
         
-        # BandWidth
-        fig_with_bandwidth.add_trace(
-            go.Scatter(x=data.index, y=bandwidth_long, name='BandWidth', 
-                      line=dict(color='darkblue', width=2)), 
-            row=2, col=1
+        # Lower subplots (cached per ticker, display period and MA windows)
+        bandwidth_plot, ma_long_change_plot, ma_short_change_plot = lower_panel_series(
+            selected_ticker, display_period, long_window, short_window
         )
-        fig_with_bandwidth.add_hline(
-            y=bandwidth_long.mean(), line_dash="dash", line_color="gray", 
-            opacity=0.5, row=2, col=1
+        
+        # BandWidth (WebGL lines, like the MA/BB overlays)
+        traces.append(
+            go.Scattergl(x=epoch_ms(bandwidth_plot.index), y=bandwidth_plot, name='BandWidth',
+                      line=dict(color='darkblue', width=2))
         )
+        trace_rows.append(2)
         
-        # MA changes
-        fig_with_bandwidth.add_trace(
-            go.Scatter(x=data.index, y=ma_long_change, name=f'MA {long_name} Change', 
-                      line=dict(color='red', width=2)), 
-            row=3, col=1
+        # MA changes (SVG lines: WebGL traces are not drawn in the xaxis3 rangeslider)
+        traces.append(
+            go.Scatter(x=epoch_ms(ma_long_change_plot.index), y=ma_long_change_plot, name=f'MA {long_name} Change',
+                      line=dict(color='red', width=2))
         )
-        fig_with_bandwidth.add_trace(
-            go.Scatter(x=data.index, y=ma_short_change, name=f'MA {short_name} Change', 
-                      line=dict(color='green', width=2)), 
-            row=3, col=1
+        trace_rows.append(3)
+        traces.append(
+            go.Scatter(x=epoch_ms(ma_short_change_plot.index), y=ma_short_change_plot, name=f'MA {short_name} Change',
+                      line=dict(color='green', width=2))
+        )
+        trace_rows.append(3)
+        
+        fig_with_bandwidth.add_traces(traces, rows=trace_rows, cols=1)
+        
+        # BandWidth mean
+        fig_with_bandwidth.add_hline(
+            y=bandwidth_mean, line_dash="dash", line_color="gray", 
+            opacity=0.5, row=2, col=1
         )
         
         # Price crossings
-        for cross_date in display_data.index[price_crossing == 1]:
-            fig_with_bandwidth.add_vline(
-                x=cross_date, line_width=2, line_dash="solid", 
-                line_color="darkgrey", opacity=0.7, row=3, col=1
-            )
+        crossing_lines = [
+            dict(type='line', xref='x3', yref='y3 domain', x0=cross_date, x1=cross_date, y0=0, y1=1,
+                 line=dict(width=2, dash='solid', color='darkgrey'), opacity=0.7)
+            for cross_date in display_data.index[price_crossing == 1]
+        ]
         
         # MA condition shading
-        combined_segment_id = (combined_ma_condition != combined_ma_condition.shift(1)).cumsum()
-        combined_df = pd.DataFrame({
-            'combined': combined_ma_condition, 
-            'segment': combined_segment_id, 
-            'date': data.index
-        })
-        for name, group in combined_df.groupby('segment'):
-            if len(group) > 0 and group['combined'].iloc[0]:
-                fig_with_bandwidth.add_vrect(
-                    x0=group['date'].iloc[0], x1=group['date'].iloc[-1], 
-                    fillcolor="rgba(200,200,200,0.3)", layer="below", 
-                    line_width=0, row=3, col=1
-                )
+        starts, ends = find_runs(combined_ma_condition)
+        ma_condition_rects = [
+            dict(type='rect', xref='x3', yref='y3 domain', x0=x0, x1=x1, y0=0, y1=1,
+                 fillcolor='rgba(200,200,200,0.3)', layer='below', line=dict(width=0))
+            for x0, x1 in zip(data.index[starts], data.index[ends - 1])
+        ]
+        
+        # Add both shape lists to the layout in one assignment
+        fig_with_bandwidth.layout.shapes = fig_with_bandwidth.layout.shapes + tuple(crossing_lines + ma_condition_rects)
         
         # Zero line and thresholds
         fig_with_bandwidth.add_hline(y=0, line_dash="solid", line_color="black", 
@@ -816,35 +988,6 @@ def update_chart(selected_ticker, period, ma_period, scale, flat_threshold_840,
             font=dict(size=10, color="green")
         )
         
-        # Layout
-        fig_with_bandwidth.update_layout(
-            height=1200, 
-            showlegend=True, 
-            hovermode='closest',
-            legend=dict(
-                orientation="h", 
-                yanchor="bottom", 
-                y=1.05,
-                xanchor="left", 
-                x=0, 
-                bgcolor="rgba(255,255,255,0.8)", 
-                bordercolor="lightgray", 
-                borderwidth=1
-            ),
-            xaxis=dict(
-                rangeselector=dict(
-                    buttons=[
-                        dict(count=1, label="1m", step="month", stepmode="backward"),
-                        dict(count=6, label="6m", step="month", stepmode="backward"), 
-                        dict(count=1, label="1y", step="year", stepmode="backward"),
-                        dict(step="all", label="All")
-                    ], 
-                    y=1.18,
-                    yanchor="top"
-                )
-            )
-        )
-        
         # Custom x-axis formatting
         if period == 'quarterly':
             tick_vals = display_data.index.tolist()
@@ -861,25 +1004,31 @@ def update_chart(selected_ticker, period, ma_period, scale, flat_threshold_840,
                 tickangle=0, row=1, col=1
             )
         
-        fig_with_bandwidth.update_xaxes(row=1, col=1, rangeslider_visible=False, showticklabels=True)
-        fig_with_bandwidth.update_xaxes(row=2, col=1, rangeslider_visible=False, showticklabels=True)
-        fig_with_bandwidth.update_xaxes(title_text="Date", row=3, col=1, rangeslider_visible=True, showticklabels=True)
-        
         y_type = 'log' if scale == 'log' else 'linear'
-        fig_with_bandwidth.update_yaxes(title_text="Price", type=y_type, autorange=True, row=1, col=1)
-        fig_with_bandwidth.update_yaxes(title_text="Band Width", row=2, col=1)
-        fig_with_bandwidth.update_yaxes(title_text="MA Change (%)", row=3, col=1)
+        fig_with_bandwidth.update_yaxes(type=y_type, row=1, col=1)
         
         return fig_with_bandwidth, ticker_name
-        
+    
     except Exception as e:
-        print(f"ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to update chart for %s: %s", selected_ticker, e)
         plotter = Plotter()
         fig = plotter.plot_candlestick(ticker_data[selected_ticker], name=selected_ticker)
         return fig, f"Error: {selected_ticker}"
 
 
 if __name__ == '__main__':
-    app.run(debug=False, port=8050)
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    dev = '--dev' in sys.argv
+    try:
+        from serve import parse_args, run
+        import waitress  # noqa: F401
+    except ImportError:
+        if not dev:
+            logger.warning("waitress is not installed, falling back to the development server")
+        dev = True
+    
+    # The single-threaded Werkzeug server handles one callback at a time, waitress uses a thread pool
+    if dev:
+        app.run(debug=False, port=8050)
+    else:
+        run(app, parse_args(sys.argv[1:]))
\ No newline at end of file
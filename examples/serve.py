@@ -0,0 +1,38 @@
+"""
+Serves the dashboard with waitress, a production WSGI server that handles
+callbacks in a pool of threads instead of one at a time.
+
+Run from the examples directory: python serve.py [--host HOST] [--port PORT] [--threads N]
+The defaults can also be set with the BB_HOST, BB_PORT and BB_THREADS environment
+variables. The dashboard has no authentication, so it only listens on localhost
+unless another host is given.
+"""
+
+import argparse
+import logging
+import os
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Bollinger Bands dashboard with waitress.")
+    parser.add_argument('--host', default=os.environ.get('BB_HOST', '127.0.0.1'),
+                        help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=int(os.environ.get('BB_PORT', 8050)),
+                        help="Port to listen on (default: 8050)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('BB_THREADS', 8)),
+                        help="Number of worker threads (default: 8)")
+    return parser.parse_args(argv)
+
+
+def run(dash_app, args):
+    """Serves a Dash app with waitress, configured by the parsed arguments"""
+    from waitress import serve
+    serve(dash_app.server, host=args.host, port=args.port, threads=args.threads)
+
+
+if __name__ == '__main__':
+    # Parse first, so bad arguments fail before the ticker data is loaded
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    from app import app
+    run(app, args)
@@ -1,3 +0,0 @@
-from setuptools import setup
-
-setup()
\ No newline at end of file
@@ -1,15 +1,7 @@
-# from .data.fetcher import DataFetcher
-# from .indicators.bollinger_bands import BollingerBandsAnalyzer
-# from .strategies.relative_strength import RelativeStrengthAnalyzer
-# from .visualization.plotter import Plotter
-# from .strategies.strategy import Strategy
-
-# __all__ = ['DataFetcher', 'BollingerBandsAnalyzer', 'RelativeStrengthAnalyzer', 'Plotter', 'Strategy']
-
 from .data.fetcher import DataFetcher
 from .indicators.bollinger_bands import BollingerBands
 from .indicators.moving_average import MovingAverage
 from .visualization.plotter import Plotter
-# from .strategies.strategy import BollingerBandStrategy
+from .strategies.strategy import BollingerBandStrategy
 
-__all__ = ['DataFetcher', 'BollingerBands', 'MovingAverage', 'Plotter']
+__all__ = ['DataFetcher', 'BollingerBands', 'MovingAverage', 'Plotter', 'BollingerBandStrategy']
@@ -1,8 +1,74 @@
+import logging
+from datetime import date
+from pathlib import Path
 import yfinance as yf
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 class DataFetcher:
-    """Fetches and resamples financial data from Yahoo Finance."""
+    """Fetches and resamples financial data from Yahoo Finance.
+
+    With a cache_dir (and pyarrow installed), fetched OHLC data is kept there as one
+    parquet file per (ticker, start_date), together with the end date it was fetched up
+    to. A file serves requests up to that end date once it was written on or after the
+    requested end date (the days before are final then). Otherwise the data is
+    downloaded again and the file replaced.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None and PARQUET_AVAILABLE else None
+
+    def _cache_file(self, ticker: str, start_date: str) -> Path:
+        return self.cache_dir / f'{ticker}_{start_date}.parquet'
+
+    def _read_cache(self, ticker: str, start_date: str, end_date: str):
+        """Returns the cached OHLC data of a ticker, or None without a fresh cache file."""
+        if self.cache_dir is None:
+            return None
+        cache_file = self._cache_file(ticker, start_date)
+        if not cache_file.exists():
+            return None
+        
+        # Days before the requested end are final once the file was written on or after it
+        end = pd.Timestamp(end_date)
+        if date.fromtimestamp(cache_file.stat().st_mtime) < end.date():
+            return None
+        
+        try:
+            ohlc_data = pd.read_parquet(cache_file)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache file %s: %s", cache_file, e)
+            return None
+        
+        # Files without the end date they were fetched up to cannot be trusted to cover the request
+        cached_end = ohlc_data.attrs.get('end_date')
+        if cached_end is None or pd.Timestamp(cached_end) < end:
+            return None
+        
+        # The end date is exclusive, like in yf.download
+        ohlc_data = ohlc_data[ohlc_data.index < end]
+        ohlc_data.attrs = {'ticker': ticker}
+        return ohlc_data
+
+    def _write_cache(self, ohlc_data: pd.DataFrame, ticker: str, start_date: str, end_date: str) -> None:
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Files of earlier versions were keyed by the end date too and are superseded by this one
+        for stale_file in self.cache_dir.glob(f'{ticker}_{start_date}_*.parquet'):
+            stale_file.unlink(missing_ok=True)
+        
+        cached = ohlc_data.copy(deep=False)
+        cached.attrs = {**ohlc_data.attrs, 'end_date': end_date}
+        cached.to_parquet(self._cache_file(ticker, start_date))
 
     def fetch_daily_data(self, tickers: list, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetches daily adjusted close prices for the given tickers."""
@@ -11,36 +77,17 @@ class DataFetcher:
 
         try:
             # Download data - auto_adjust=True means 'Close' is already adjusted
-            daily_data = yf.download(tickers, start=start_date, end=end_date, 
-                                    progress=False, auto_adjust=True)
+            daily_data = yf.download(tickers, start=start_date, end=end_date, group_by='column',
+                                     progress=False, auto_adjust=True)
 
             if daily_data.empty:
                 raise ValueError(f"No data found for tickers: {tickers}.")
 
-            # Handle single ticker case
-            if len(tickers) == 1:
-                # With auto_adjust=True, use 'Close' instead of 'Adj Close'
-                if isinstance(daily_data.columns, pd.MultiIndex):
-                    if 'Close' in daily_data.columns.get_level_values(0):
-                        daily_data = daily_data['Close']
-                else:
-                    if 'Close' in daily_data.columns:
-                        daily_data = daily_data[['Close']]
-                    else:
-                        raise ValueError("No 'Close' column found.")
-                
-                # Rename to ticker name
-                daily_data.columns = tickers
-            
-            # Handle multiple tickers case
+            # Grouped by column, 'Close' is one slice with a column per ticker
+            if isinstance(daily_data.columns, pd.MultiIndex):
+                daily_data = daily_data['Close']
             else:
-                if isinstance(daily_data.columns, pd.MultiIndex):
-                    if 'Close' in daily_data.columns.get_level_values(0):
-                        daily_data = daily_data['Close']
-                    else:
-                        raise ValueError("No 'Close' column found.")
-                else:
-                    raise ValueError("Unexpected column structure for multiple tickers.")
+                daily_data = daily_data[['Close']].rename(columns={'Close': tickers[0]})
 
             return daily_data
             
@@ -49,6 +96,10 @@ class DataFetcher:
         
     def fetch_ohlc_data(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetches OHLC data for a single ticker."""
+        cached = self._read_cache(ticker, start_date, end_date)
+        if cached is not None:
+            return cached
+        
         try:
             data = yf.download(ticker, start=start_date, end=end_date, 
                             progress=False, auto_adjust=True)
@@ -56,7 +107,8 @@ class DataFetcher:
             if data.empty:
                 raise ValueError(f"No data found for ticker: {ticker}")
             
-            ohlc_data = data[['Open', 'High', 'Low', 'Close']].copy()
+            # No explicit copy: the selection is a new frame and is never written to
+            ohlc_data = data.loc[:, ['Open', 'High', 'Low', 'Close']]
             
             # Flatten MultiIndex columns if present
             if isinstance(ohlc_data.columns, pd.MultiIndex):
@@ -64,14 +116,67 @@ class DataFetcher:
             
             # Store ticker as attribute (metadata)
             ohlc_data.attrs['ticker'] = ticker
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch OHLC data: {e}")
+        
+        self._write_cache(ohlc_data, ticker, start_date, end_date)
+        return ohlc_data
+
+    def fetch_ohlc_data_batch(self, tickers: list, start_date: str, end_date: str) -> dict:
+        """Fetches OHLC data for several tickers with a single download."""
+        if not tickers:
+            raise ValueError("No tickers provided.")
+
+        ohlc_by_ticker = {}
+        for ticker in tickers:
+            cached = self._read_cache(ticker, start_date, end_date)
+            if cached is not None:
+                ohlc_by_ticker[ticker] = cached
+        
+        missing = [ticker for ticker in tickers if ticker not in ohlc_by_ticker]
+        if not missing:
+            return ohlc_by_ticker
+        
+        try:
+            # One request for all uncached tickers - yfinance downloads them in parallel threads
+            data = yf.download(missing, start=start_date, end=end_date, group_by='ticker',
+                               threads=True, progress=False, auto_adjust=True)
+            
+            if data.empty:
+                raise ValueError(f"No data found for tickers: {missing}")
             
-            return ohlc_data
+            # Older yfinance versions return flat columns for a single ticker
+            if not isinstance(data.columns, pd.MultiIndex):
+                data = pd.concat({missing[0]: data}, axis=1)
+            
+            for ticker in missing:
+                if ticker not in data.columns.get_level_values(0):
+                    raise ValueError(f"No data found for ticker: {ticker}")
+                
+                # The index covers the trading days of all tickers, drop the days without data for this one
+                ohlc_data = data[ticker][['Open', 'High', 'Low', 'Close']].dropna(how='all')
+                if ohlc_data.empty:
+                    raise ValueError(f"No data found for ticker: {ticker}")
+                
+                # Store ticker as attribute (metadata)
+                ohlc_data.attrs['ticker'] = ticker
+                ohlc_by_ticker[ticker] = ohlc_data
         
         except Exception as e:
             raise RuntimeError(f"Failed to fetch OHLC data: {e}")
+        
+        for ticker in missing:
+            self._write_cache(ohlc_by_ticker[ticker], ticker, start_date, end_date)
+        
+        # Keep the order of the requested tickers
+        return {ticker: ohlc_by_ticker[ticker] for ticker in tickers}
 
     def resample_to_monthly(self, daily_data: pd.DataFrame) -> pd.DataFrame:
         """Resamples daily data to monthly closing prices."""
         if daily_data.empty:
             raise ValueError("No daily data provided for resampling.")
-        return daily_data.resample('M').last()
\ No newline at end of file
+        
+        # Grouping by calendar month skips the resampler, the rows are labelled with the month end
+        monthly_data = daily_data.groupby(daily_data.index.to_period('M')).last()
+        return monthly_data.set_axis(monthly_data.index.to_timestamp(how='end').normalize())
\ No newline at end of file
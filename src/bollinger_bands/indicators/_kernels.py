@@ -0,0 +1,184 @@
+"""
+Rolling Window Kernels
+
+This module contains compiled single-pass kernels for rolling window statistics.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from bollinger_bands.utils._njit import njit, NUMBA_AVAILABLE
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+
+@njit(cache=True)
+def _rolling_mean_std_multi_kernel(values, windows):
+    """
+    Rolling means and sample standard deviations for several windows in one pass.
+    
+    Running (Welford) mean and squared deviation sums of every window are updated
+    as values enter and leave it. Windows with missing values are NaN, and windows
+    of identical values get a standard deviation of exactly 0.
+    """
+    n = len(values)
+    n_windows = len(windows)
+    rolling_mean = np.full((n_windows, n), np.nan)
+    rolling_std = np.full((n_windows, n), np.nan)
+    
+    nobs = np.zeros(n_windows, dtype=np.int64)
+    mean = np.zeros(n_windows)
+    sum_sq_dev = np.zeros(n_windows)
+    same_count = 0
+    prev_value = np.nan
+    
+    for i in range(n):
+        value = values[i]
+        
+        # Length of the run of identical values ending here
+        if value == prev_value:
+            same_count += 1
+        else:
+            same_count = 1
+        prev_value = value
+        
+        for k in range(n_windows):
+            window = windows[k]
+            
+            # Add the entering value
+            if not np.isnan(value):
+                nobs[k] += 1
+                delta = value - mean[k]
+                mean[k] += delta / nobs[k]
+                sum_sq_dev[k] += delta * (value - mean[k])
+            
+            # Remove the leaving value
+            if i >= window:
+                old_value = values[i - window]
+                if not np.isnan(old_value):
+                    nobs[k] -= 1
+                    if nobs[k] == 0:
+                        mean[k] = 0.0
+                        sum_sq_dev[k] = 0.0
+                    else:
+                        delta = old_value - mean[k]
+                        mean[k] -= delta / nobs[k]
+                        sum_sq_dev[k] -= delta * (old_value - mean[k])
+            
+            if nobs[k] < window:
+                continue
+            
+            if same_count >= window:
+                rolling_mean[k, i] = value
+                sum_sq_dev_window = 0.0
+            else:
+                rolling_mean[k, i] = mean[k]
+                sum_sq_dev_window = max(sum_sq_dev[k], 0.0)
+            
+            # The sample standard deviation of a single value is undefined
+            if window > 1:
+                rolling_std[k, i] = np.sqrt(sum_sq_dev_window / (window - 1))
+    
+    return rolling_mean, rolling_std
+
+
+@njit(cache=True)
+def _rolling_mean_std_kernel(values, window):
+    """Rolling mean and sample standard deviation of a single window in one pass"""
+    rolling_mean, rolling_std = _rolling_mean_std_multi_kernel(values, np.array([window], dtype=np.int64))
+    return rolling_mean[0], rolling_std[0]
+
+
+def _rolling_mean_std_windows(values, window):
+    """Rolling mean and sample standard deviation as reductions over a strided view of all windows"""
+    n = len(values)
+    rolling_mean = np.full(n, np.nan)
+    rolling_std = np.full(n, np.nan)
+    if n < window:
+        return rolling_mean, rolling_std
+    
+    # Reductions accumulate in float64 for float32 input as well
+    windows = sliding_window_view(values, window)
+    rolling_mean[window - 1:] = windows.mean(axis=1, dtype=np.float64)
+    if window > 1:
+        rolling_std[window - 1:] = windows.std(axis=1, ddof=1, dtype=np.float64)
+    
+    return rolling_mean, rolling_std
+
+
+def _rolling_mean_std_polars(values, windows):
+    """Rolling means and sample standard deviations of several windows as one lazy polars query"""
+    value = pl.col('value').cast(pl.Float64)
+    columns = []
+    for k, window in enumerate(windows):
+        columns.append(value.rolling_mean(window).alias(f'mean_{k}'))
+        columns.append(value.rolling_std(window, ddof=1).alias(f'std_{k}'))
+    
+    # The rolling expressions of all windows run in parallel on the Rust side
+    result = pl.DataFrame({'value': values}).lazy().select(columns).collect()
+    
+    rolling_means_stds = []
+    for k, window in enumerate(windows):
+        rolling_mean = result[f'mean_{k}'].to_numpy().astype(np.float64)
+        rolling_std = result[f'std_{k}'].to_numpy().astype(np.float64)
+        if window == 1:
+            rolling_std[:] = np.nan
+        rolling_means_stds.append((rolling_mean, rolling_std))
+    return rolling_means_stds
+
+
+def _float_array(values):
+    """Contiguous float32 or float64 array of the values, without converting float32 to float64"""
+    values = np.asarray(values)
+    dtype = np.float32 if values.dtype == np.float32 else np.float64
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def rolling_mean_std(values, window):
+    """
+    Rolling mean and sample standard deviation (ddof=1) over complete windows.
+    
+    Args:
+        values: 1-D array of values (float32 is read as is, sums accumulate in float64)
+        window: Window length
+    
+    Returns:
+        tuple: (np.ndarray, np.ndarray) - float64 rolling mean and standard deviation,
+        NaN where the window is incomplete or contains missing values
+    """
+    values = _float_array(values)
+    
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_std_kernel(values, int(window))
+    
+    # Without numba the kernel loop would run as plain Python, polars or vectorized NumPy reductions are faster
+    if POLARS_AVAILABLE:
+        return _rolling_mean_std_polars(values, [int(window)])[0]
+    return _rolling_mean_std_windows(values, int(window))
+
+
+def rolling_mean_std_multi(values, windows):
+    """
+    Rolling means and sample standard deviations (ddof=1) of several windows,
+    computed in one pass over the values.
+    
+    Args:
+        values: 1-D array of values (float32 is read as is, sums accumulate in float64)
+        windows: Window lengths
+    
+    Returns:
+        list: One (np.ndarray, np.ndarray) tuple of rolling mean and standard deviation
+        per window, as returned by rolling_mean_std
+    """
+    values = _float_array(values)
+    
+    if NUMBA_AVAILABLE:
+        rolling_means, rolling_stds = _rolling_mean_std_multi_kernel(values, np.asarray(windows, dtype=np.int64))
+        return list(zip(rolling_means, rolling_stds))
+    
+    if POLARS_AVAILABLE:
+        return _rolling_mean_std_polars(values, [int(window) for window in windows])
+    return [_rolling_mean_std_windows(values, int(window)) for window in windows]
@@ -1,10 +1,15 @@
 # indicators/band_width.py
+from bollinger_bands.indicators.bollinger_bands import BollingerBands
+
+
 class BandWidth:
     def __init__(self, window=20):
         self.window = window
     
     def calculate(self, bb_values):
-        """Calculate the width between upper and lower bands"""
+        """Calculate the width between upper and lower bands (price data is rolled into bands first)"""
+        if 'upper' not in bb_values:
+            bb_values = BollingerBands(window=self.window).calculate(bb_values)
         width = bb_values['upper'] - bb_values['lower']
         return width
     
@@ -38,15 +38,31 @@
 #         return self.monthly_data
 
 
+import pandas as pd
+from bollinger_bands.indicators._kernels import rolling_mean_std, rolling_mean_std_multi
+
+
 class BollingerBands:
     def __init__(self, window=20, num_std=2):
         self.window = window
         self.num_std = num_std
     
     def calculate(self, data):
-        """Calculate Bollinger Bands"""
-        sma = data['Close'].rolling(window=self.window).mean()
-        std = data['Close'].rolling(window=self.window).std()
+        """Calculate Bollinger Bands (rolling mean and standard deviation in one compiled pass)"""
+        close = data['Close']
+        sma_values, std_values = rolling_mean_std(close.to_numpy(), self.window)
+        return self._bands(close, sma_values, std_values)
+    
+    def calculate_multi(self, data, windows):
+        """Calculate Bollinger Bands for several windows in one pass over the close prices"""
+        close = data['Close']
+        results = rolling_mean_std_multi(close.to_numpy(), windows)
+        return {window: self._bands(close, sma_values, std_values)
+                for window, (sma_values, std_values) in zip(windows, results)}
+    
+    def _bands(self, close, sma_values, std_values):
+        sma = pd.Series(sma_values, index=close.index, name=close.name)
+        std = pd.Series(std_values, index=close.index, name=close.name)
         
         upper_band = sma + (std * self.num_std)
         lower_band = sma - (std * self.num_std)
@@ -6,6 +6,54 @@ This module handles detection of price crossings below moving averages.
 
 import pandas as pd
 import numpy as np
+from bollinger_bands.utils._njit import njit, NUMBA_AVAILABLE
+from bollinger_bands.utils.runs import find_runs
+
+
+@njit(cache=True)
+def _confirmed_crossings_kernel(is_below, smoothing_window):
+    """Positions of above-to-below moves with enough days above before and below after"""
+    n = len(is_below)
+    min_days = smoothing_window * 0.6
+    crossings = np.empty(n, dtype=np.int64)
+    count = 0
+    
+    for i in range(1, n):
+        if not is_below[i] or is_below[i - 1]:
+            continue
+        
+        days_above_before = 0
+        for j in range(max(0, i - smoothing_window), i):
+            if not is_below[j]:
+                days_above_before += 1
+        
+        days_below_after = 0
+        for j in range(i, min(n, i + smoothing_window)):
+            if is_below[j]:
+                days_below_after += 1
+        
+        if days_above_before >= min_days and days_below_after >= min_days:
+            crossings[count] = i
+            count += 1
+    
+    return crossings[:count]
+
+
+def _confirmed_crossings_cumsum(is_below, smoothing_window):
+    """Positions of confirmed above-to-below moves, counting the days from int8 cumulative sums"""
+    # Transitions from above to below are the starts of below-MA runs (except at the first day)
+    transitions, _ = find_runs(is_below)
+    transitions = transitions[transitions > 0]
+    
+    # Days above MA before and below MA from each transition
+    n = len(is_below)
+    above_cumsum = np.concatenate(([0], np.cumsum((~is_below).astype(np.int8), dtype=np.int64)))
+    below_cumsum = np.concatenate(([0], np.cumsum(is_below.astype(np.int8), dtype=np.int64)))
+    days_above_before = above_cumsum[transitions] - above_cumsum[np.maximum(0, transitions - smoothing_window)]
+    days_below_after = below_cumsum[np.minimum(n, transitions + smoothing_window)] - below_cumsum[transitions]
+    
+    min_days = smoothing_window * 0.6
+    return transitions[(days_above_before >= min_days) & (days_below_after >= min_days)]
 
 
 def detect_price_crossing_down_daily(data, ma_values, smoothing_window=5):
@@ -13,46 +61,33 @@ def detect_price_crossing_down_daily(data, ma_values, smoothing_window=5):
     Detect when price crosses below MA for DAILY data with smoothing.
     Uses a moving average of the price to reduce noise.
     """
-    crossing_signal = pd.Series(0, index=data.index, dtype=float)
+    # 0/1 output buffer, wrapped in a Series once at the end
+    crossing_signal = np.zeros(len(data), dtype=np.int8)
     
-    # Clean data - remove NaN values
+    # Clean data - remove NaN values (no DataFrame copy, only the Close column is needed)
     valid_mask = data['Close'].notna() & ma_values.notna()
-    clean_data = data[valid_mask].copy()
+    clean_close = data['Close'][valid_mask]
     clean_ma = ma_values[valid_mask]
     
-    if len(clean_data) < smoothing_window * 2:
-        return crossing_signal
+    if len(clean_close) < smoothing_window * 2:
+        return pd.Series(crossing_signal, index=data.index)
     
     # Apply smoothing to price to reduce noise
-    smoothed_price = clean_data['Close'].rolling(window=smoothing_window, min_periods=1).mean()
+    smoothed_price = clean_close.rolling(window=smoothing_window, min_periods=1).mean()
     
-    # Calculate if smoothed price is below MA
-    is_below = smoothed_price < clean_ma
-    is_above = smoothed_price >= clean_ma
+    # Calculate if smoothed price is below MA (NaNs are removed, so above is the complement)
+    is_below = np.ascontiguousarray(smoothed_price < clean_ma, dtype=np.bool_)
     
-    # Find transitions from above to below
-    prev_above = is_above.shift(1).fillna(False)
-    transitions = is_below & prev_above
+    # Price was above MA for at least 60% of days before and stays below for at least 60% after
+    # Without numba the kernel loop would run as plain Python, the vectorized cumulative sums are faster
+    if NUMBA_AVAILABLE:
+        crossings = _confirmed_crossings_kernel(is_below, int(smoothing_window))
+    else:
+        crossings = _confirmed_crossings_cumsum(is_below, int(smoothing_window))
     
-    for i in range(len(clean_data)):
-        if not transitions.iloc[i]:
-            continue
-            
-        # Check if price was above MA for sufficient time before crossing
-        lookback_start = max(0, i - smoothing_window)
-        was_above = is_above.iloc[lookback_start:i]
-        
-        if was_above.sum() < smoothing_window * 0.6:  # At least 60% of days above
-            continue
-        
-        # Check if price stays below MA for sufficient time after crossing
-        lookahead_end = min(len(clean_data), i + smoothing_window)
-        stays_below = is_below.iloc[i:lookahead_end]
-        
-        if stays_below.sum() >= smoothing_window * 0.6:  # At least 60% of days below
-            crossing_signal.loc[clean_data.index[i]] = 1
+    crossing_signal[np.flatnonzero(valid_mask.to_numpy())[crossings]] = 1
     
-    return crossing_signal
+    return pd.Series(crossing_signal, index=data.index)
 
 
 def detect_price_crossing_down_period(data, ma_values):
@@ -60,29 +95,21 @@ def detect_price_crossing_down_period(data, ma_values):
     Detect when price crosses below MA for MONTHLY/QUARTERLY data.
     Simple and clean: Open >= MA and Close < MA means crossing occurred during the period.
     """
-    crossing_signal = pd.Series(0, index=data.index, dtype=float)
+    # Valid periods have Open, Close and MA values
+    valid_mask = (data['Open'].notna() & data['Close'].notna() & ma_values.notna()).to_numpy()
     
-    # Clean data - remove NaN values
-    valid_mask = data['Open'].notna() & data['Close'].notna() & ma_values.notna()
-    clean_data = data[valid_mask].copy()
-    clean_ma = ma_values[valid_mask]
+    if valid_mask.sum() < 2:
+        return pd.Series(np.zeros(len(data), dtype=np.int8), index=data.index)
     
-    if len(clean_data) < 2:
-        return crossing_signal
+    period_open = data['Open'].to_numpy()
+    period_close = data['Close'].to_numpy()
+    period_ma = ma_values.to_numpy()
     
-    for i in range(len(clean_data)):
-        period_open = clean_data['Open'].iloc[i]
-        period_close = clean_data['Close'].iloc[i]
-        period_ma = clean_ma.iloc[i]
-        period_date = clean_data.index[i]
-        
-        # Check if price crossed down during this period
-        # Open was above or at MA, Close is below MA
-        if period_open >= period_ma and period_close < period_ma:
-            crossing_signal.loc[period_date] = 1
-            print(f"  Price crossing detected at {period_date.date()}: Open={period_open:.2f} >= MA={period_ma:.2f}, Close={period_close:.2f} < MA")
+    # Check if price crossed down during each period
+    # Open was above or at MA, Close is below MA
+    crossed = valid_mask & (period_open >= period_ma) & (period_close < period_ma)
     
-    return crossing_signal
+    return pd.Series(crossed.astype(np.int8), index=data.index)
 
 
 def check_ma_conditions_for_period(period_end_date, period_start_date, daily_data, ma_condition, threshold=0.5):
@@ -99,15 +126,83 @@ def check_ma_conditions_for_period(period_end_date, period_start_date, daily_dat
     Returns:
         tuple: (bool, float, int, int) - (conditions_met, actual_percentage, days_with_condition, total_days)
     """
-    # Find daily data between period start and end
-    mask = (daily_data.index >= period_start_date) & (daily_data.index <= period_end_date)
+    # Find daily data between period start and end (binary search on the sorted index)
+    start_pos, end_pos = daily_data.index.slice_locs(period_start_date, period_end_date)
     
-    if mask.sum() == 0:
+    if end_pos <= start_pos:
         return False, 0.0, 0, 0
     
     # Check what % of trading days had MA conditions met
-    days_in_period = mask.sum()
-    days_with_conditions = ma_condition[mask].sum()
+    days_in_period = end_pos - start_pos
+    days_with_conditions = ma_condition.iloc[start_pos:end_pos].sum()
     condition_pct = days_with_conditions / days_in_period
     
     return condition_pct >= threshold, condition_pct, days_with_conditions, days_in_period
+
+
+def ma_condition_share_in_windows(daily_index, ma_condition, start_dates, end_dates):
+    """
+    Share of trading days with MA conditions met in many date windows at once.
+    
+    Vectorized equivalent of check_ma_conditions_for_period for each
+    (start_dates[k], end_dates[k]) pair (both inclusive), using one cumulative
+    sum over the daily conditions and binary searches for the window bounds.
+    
+    Args:
+        daily_index: Sorted DatetimeIndex of the daily data
+        ma_condition: Boolean series or array of daily MA conditions
+        start_dates: Window start dates
+        end_dates: Window end dates
+    
+    Returns:
+        tuple: (np.ndarray, np.ndarray) - (share of days with conditions met, trading days in window),
+        share is 0 for windows without trading days
+    """
+    condition_cumsum = np.concatenate(([0], np.cumsum(np.asarray(ma_condition, dtype=bool), dtype=np.int64)))
+    start_pos = daily_index.searchsorted(start_dates, side='left')
+    end_pos = np.maximum(daily_index.searchsorted(end_dates, side='right'), start_pos)
+    
+    days_in_window = end_pos - start_pos
+    days_with_conditions = condition_cumsum[end_pos] - condition_cumsum[start_pos]
+    share = days_with_conditions / np.maximum(days_in_window, 1)
+    
+    return share, days_in_window
+
+
+def _period_keys(dates, period):
+    """Integer month or quarter number of each date"""
+    months = dates.month.to_numpy() - 1
+    if period == 'quarterly':
+        return dates.year.to_numpy() * 4 + months // 3
+    return dates.year.to_numpy() * 12 + months
+
+
+def ma_condition_share_by_period(daily_index, ma_condition, period, dates=None):
+    """
+    Share of trading days with MA conditions met per month or quarter.
+    
+    Args:
+        daily_index: DatetimeIndex of the daily data
+        ma_condition: Boolean series or array of daily MA conditions
+        period: 'monthly' or 'quarterly'
+        dates: Optional DatetimeIndex to look the share up for instead of the daily dates
+    
+    Returns:
+        np.ndarray: Share of the period containing each day (or each of dates),
+        NaN for periods without trading days
+    """
+    daily_keys = _period_keys(daily_index, period)
+    period_keys, period_ids = np.unique(daily_keys, return_inverse=True)
+    condition = np.asarray(ma_condition, dtype=bool)
+    days_with_conditions = np.bincount(period_ids, weights=condition, minlength=len(period_keys))
+    days_in_period = np.bincount(period_ids, minlength=len(period_keys))
+    share = days_with_conditions / np.maximum(days_in_period, 1)
+    
+    if dates is None:
+        return share[period_ids]
+    
+    date_keys = _period_keys(dates, period)
+    if len(period_keys) == 0:
+        return np.full(len(date_keys), np.nan)
+    pos = np.minimum(np.searchsorted(period_keys, date_keys), len(period_keys) - 1)
+    return np.where(period_keys[pos] == date_keys, share[pos], np.nan)
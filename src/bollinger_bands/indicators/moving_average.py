@@ -1,12 +1,18 @@
+import pandas as pd
+from bollinger_bands.indicators._kernels import rolling_mean_std
+
+
 class MovingAverage:
     def __init__(self, window=20):
         self.window = window
     
     def calculate(self, data):
-        """Calculate simple moving average"""
-        return data['Close'].rolling(window=self.window).mean()
+        """Calculate simple moving average (the rolling mean of the Bollinger Band kernels)"""
+        close = data['Close']
+        sma_values, _ = rolling_mean_std(close.to_numpy(), self.window)
+        return pd.Series(sma_values, index=close.index, name=close.name)
     
     def calculate_change(self, data):
         """Calculate the percentage change of the moving average"""
         sma = self.calculate(data)
-        return sma.pct_change() * 100
\ No newline at end of file
+        return sma.pct_change() * 100
@@ -112,8 +112,8 @@ def calculate_metrics_at_date(data, target_date):
     Returns:
         Dictionary with all metrics
     """
-    # Filter data up to target date
-    data_subset = data[data.index <= target_date]
+    # Filter data up to target date (label slice on the sorted index)
+    data_subset = data.loc[:target_date]
     
     if len(data_subset) == 0:
         return {
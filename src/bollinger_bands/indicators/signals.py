@@ -6,84 +6,131 @@ This module contains all candlestick pattern detection and signal generation log
 
 import pandas as pd
 import numpy as np
+from bollinger_bands.utils._njit import njit
 
 
-def detect_bullish_engulfing(data):
-    """Detect bullish engulfing candlestick pattern"""
-    signals = pd.Series(False, index=data.index)
-    
-    for i in range(1, len(data)):
-        prev_open = data['Open'].iloc[i-1]
-        prev_close = data['Close'].iloc[i-1]
-        curr_open = data['Open'].iloc[i]
-        curr_close = data['Close'].iloc[i]
-        
-        prev_bearish = prev_close < prev_open
-        curr_bullish = curr_close > curr_open
-        engulfs = curr_open <= prev_close and curr_close >= prev_open
-        
-        if prev_bearish and curr_bullish and engulfs:
-            signals.iloc[i] = True
+@njit(cache=True)
+def _bullish_engulfing_kernel(open_prices, close_prices):
+    """Bullish engulfing pattern, comparing each candle with the previous one as whole arrays"""
+    signals = np.zeros(len(open_prices), dtype=np.bool_)
+    
+    prev_open = open_prices[:-1]
+    prev_close = close_prices[:-1]
+    curr_open = open_prices[1:]
+    curr_close = close_prices[1:]
     
+    prev_bearish = prev_close < prev_open
+    curr_bullish = curr_close > curr_open
+    engulfs = (curr_open <= prev_close) & (curr_close >= prev_open)
+    
+    signals[1:] = prev_bearish & curr_bullish & engulfs
     return signals
 
 
-def detect_hammer(data):
-    """Detect hammer and inverted hammer patterns"""
-    signals = pd.Series(False, index=data.index)
-    
-    for i in range(len(data)):
-        open_price = data['Open'].iloc[i]
-        close_price = data['Close'].iloc[i]
-        high_price = data['High'].iloc[i]
-        low_price = data['Low'].iloc[i]
-        
-        body = abs(close_price - open_price)
-        total_range = high_price - low_price
-        
-        if total_range == 0:
-            continue
-            
-        lower_shadow = min(open_price, close_price) - low_price
-        upper_shadow = high_price - max(open_price, close_price)
-        
-        is_hammer = (lower_shadow > 2 * body) and (upper_shadow < body)
-        is_inverted = (upper_shadow > 2 * body) and (lower_shadow < body)
-        
-        if is_hammer or is_inverted:
-            signals.iloc[i] = True
+@njit(cache=True)
+def _hammer_kernel(open_prices, high_prices, low_prices, close_prices):
+    """Hammer and inverted hammer patterns as element-wise array operations"""
+    body = np.abs(close_prices - open_prices)
+    total_range = high_prices - low_prices
+    
+    lower_shadow = np.minimum(open_prices, close_prices) - low_prices
+    upper_shadow = high_prices - np.maximum(open_prices, close_prices)
+    
+    is_hammer = (lower_shadow > 2 * body) & (upper_shadow < body)
+    is_inverted = (upper_shadow > 2 * body) & (lower_shadow < body)
+    
+    # Candles without any range never qualify
+    return (total_range != 0) & (is_hammer | is_inverted)
+
+
+@njit(cache=True)
+def _morning_star_kernel(open_prices, close_prices):
+    """Morning star pattern using three aligned slices for the three candles"""
+    signals = np.zeros(len(open_prices), dtype=np.bool_)
     
+    first_open = open_prices[:-2]
+    first_close = close_prices[:-2]
+    second_open = open_prices[1:-1]
+    second_close = close_prices[1:-1]
+    third_open = open_prices[2:]
+    third_close = close_prices[2:]
+    
+    first_bearish = first_close < first_open
+    
+    second_body = np.abs(second_close - second_open)
+    first_body = np.abs(first_close - first_open)
+    second_small = second_body < 0.3 * first_body
+    
+    third_bullish = third_close > third_open
+    
+    recovers = third_close > (first_open + first_close) / 2
+    
+    signals[2:] = first_bearish & second_small & third_bullish & recovers
     return signals
 
 
+@njit(cache=True)
+def _reentry_kernel(any_pattern, is_below_ma, close_prices, bb_lower, bb_upper, bb_distance_threshold):
+    """Pattern, below-MA and near-lower-BB conditions combined in one array expression"""
+    distance_pct = ((close_prices - bb_lower) / (bb_upper - bb_lower)) * 100
+    return any_pattern & is_below_ma & (distance_pct <= bb_distance_threshold)
+
+
+def _price_array(data, column):
+    """Extract a price column as a contiguous float array (float32 prices are kept as float32)"""
+    values = data[column].to_numpy()
+    dtype = np.float32 if values.dtype == np.float32 else np.float64
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def _ohlc_arrays(data):
+    """OHLC columns as a struct of contiguous float arrays, extracted once for all detectors"""
+    return {column: _price_array(data, column) for column in ('Open', 'High', 'Low', 'Close')}
+
+
+def detect_bullish_engulfing(data):
+    """Detect bullish engulfing candlestick pattern"""
+    signals = _bullish_engulfing_kernel(_price_array(data, 'Open'), _price_array(data, 'Close'))
+    return pd.Series(signals, index=data.index)
+
+
+def detect_hammer(data):
+    """Detect hammer and inverted hammer patterns"""
+    signals = _hammer_kernel(
+        _price_array(data, 'Open'), _price_array(data, 'High'),
+        _price_array(data, 'Low'), _price_array(data, 'Close')
+    )
+    return pd.Series(signals, index=data.index)
+
+
 def detect_morning_star(data):
     """Detect morning star pattern (3-candle reversal)"""
-    signals = pd.Series(False, index=data.index)
-    
-    for i in range(2, len(data)):
-        first_open = data['Open'].iloc[i-2]
-        first_close = data['Close'].iloc[i-2]
-        first_bearish = first_close < first_open
-        
-        second_open = data['Open'].iloc[i-1]
-        second_close = data['Close'].iloc[i-1]
-        second_body = abs(second_close - second_open)
-        first_body = abs(first_close - first_open)
-        second_small = second_body < 0.3 * first_body
-        
-        third_open = data['Open'].iloc[i]
-        third_close = data['Close'].iloc[i]
-        third_bullish = third_close > third_open
-        
-        recovers = third_close > (first_open + first_close) / 2
-        
-        if first_bearish and second_small and third_bullish and recovers:
-            signals.iloc[i] = True
+    signals = _morning_star_kernel(_price_array(data, 'Open'), _price_array(data, 'Close'))
+    return pd.Series(signals, index=data.index)
+
+
+def detect_candlestick_patterns(data):
+    """
+    Detect all candlestick patterns at once.
     
-    return signals
+    The patterns only depend on the OHLC data, so the result can be computed
+    once per ticker and reused for every combination of enabled signals.
+    
+    Args:
+        data: OHLC DataFrame
+    
+    Returns:
+        DataFrame with one boolean column per signal type ('engulfing', 'hammer', 'morning_star')
+    """
+    prices = _ohlc_arrays(data)
+    return pd.DataFrame({
+        'engulfing': _bullish_engulfing_kernel(prices['Open'], prices['Close']),
+        'hammer': _hammer_kernel(prices['Open'], prices['High'], prices['Low'], prices['Close']),
+        'morning_star': _morning_star_kernel(prices['Open'], prices['Close'])
+    }, index=data.index)
 
 
-def detect_reentry_signals(data, ma_values, bb_values, enabled_signals, bb_distance_threshold=10):
+def detect_reentry_signals(data, ma_values, bb_values, enabled_signals, bb_distance_threshold=10, patterns=None, is_below_ma=None):
     """
     Detect re-entry signals combining candlestick patterns with MA and BB conditions.
     
@@ -93,25 +140,31 @@ def detect_reentry_signals(data, ma_values, bb_values, enabled_signals, bb_dista
         bb_values: Dictionary with 'upper', 'middle', 'lower' Bollinger Bands
         enabled_signals: List of enabled signal types ['engulfing', 'hammer', 'morning_star']
         bb_distance_threshold: Maximum distance from lower BB (%)
-        
+        patterns: Optional precomputed output of detect_candlestick_patterns(data)
+        is_below_ma: Optional precomputed boolean array of Close < ma_values
+    
     Returns:
         Series of boolean values indicating re-entry signals
     """
-    # Detect patterns based on enabled signals
-    bullish_engulfing = detect_bullish_engulfing(data) if 'engulfing' in enabled_signals else pd.Series(False, index=data.index)
-    hammer = detect_hammer(data) if 'hammer' in enabled_signals else pd.Series(False, index=data.index)
-    morning_star = detect_morning_star(data) if 'morning_star' in enabled_signals else pd.Series(False, index=data.index)
-    
-    # Combine pattern signals
-    any_reentry_signal = bullish_engulfing | hammer | morning_star
+    # Combine the enabled pattern signals into one boolean array
+    detectors = {'engulfing': detect_bullish_engulfing, 'hammer': detect_hammer, 'morning_star': detect_morning_star}
+    any_reentry_signal = np.zeros(len(data), dtype=bool)
+    for signal_name, detector in detectors.items():
+        if signal_name in enabled_signals:
+            pattern = patterns[signal_name] if patterns is not None else detector(data)
+            any_reentry_signal |= pattern.to_numpy(dtype=bool)
     
-    # Check conditions
-    is_below_ma = data['Close'] < ma_values
-    bb_width = bb_values['upper'] - bb_values['lower']
-    distance_pct = ((data['Close'] - bb_values['lower']) / bb_width) * 100
-    near_lower_bb = distance_pct <= bb_distance_threshold
+    if not any_reentry_signal.any():
+        return pd.Series(False, index=data.index)
     
     # Final signal: pattern + below MA + near lower BB
-    reentry_signals = any_reentry_signal & is_below_ma & near_lower_bb
+    close = _price_array(data, 'Close')
+    if is_below_ma is None:
+        is_below_ma = close < ma_values.to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reentry_signals = _reentry_kernel(
+            any_reentry_signal, np.ascontiguousarray(is_below_ma, dtype=np.bool_), close,
+            _price_array(bb_values, 'lower'), _price_array(bb_values, 'upper'), float(bb_distance_threshold)
+        )
     
-    return reentry_signals
+    return pd.Series(reentry_signals, index=data.index)
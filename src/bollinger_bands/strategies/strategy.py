@@ -0,0 +1,12 @@
+from ..indicators.moving_average import MovingAverage
+from ..indicators.bollinger_bands import BollingerBands
+
+
+class BollingerBandStrategy:
+    def __init__(self):
+        self.bb = BollingerBands(window=20, num_std=2)
+        self.ma = MovingAverage(window=20)
+    
+    def generate_signals(self, data):
+        bb_values = self.bb.calculate(data)
+        # Use bb_values to determine buy/sell signals
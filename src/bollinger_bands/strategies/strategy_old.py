@@ -1,8 +1,8 @@
 # from bollinger_bands.indicators.bollinger_bands import BollingerBands
 # from bollinger_bands.indicators.moving_average import MovingAverage
 
-from ..indicators.moving_average import MovingAverage
-from ..indicators.bollinger_bands import BollingerBands
+# BollingerBandStrategy lives in strategy.py, re-exported for existing imports
+from .strategy import BollingerBandStrategy  # noqa: F401
 
 # from bollinger_bands.indicators.bollinger_bands import BollingerBandsAnalyzer
 # from bollinger_bands.strategies.relative_strength import RelativeStrengthAnalyzer
@@ -31,13 +31,3 @@ from ..indicators.bollinger_bands import BollingerBands
 #             self.rs_analyzer.fetch_data()
 #             self.rs_analyzer.calculate_relative_strength()
 #             self.rs_analyzer.plot_relative_strength()
-
-
-class BollingerBandStrategy:
-    def __init__(self):
-        self.bb = BollingerBands(window=20, num_std=2)
-        self.ma = MovingAverage(window=20)
-    
-    def generate_signals(self, data):
-        bb_values = self.bb.calculate(data)
-        # Use bb_values to determine buy/sell signals
\ No newline at end of file
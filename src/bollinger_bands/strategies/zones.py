@@ -4,11 +4,57 @@ Zone Identification Module
 This module handles identification of trading zones (entry to re-entry).
 """
 
-import pandas as pd
-from bollinger_bands.indicators.crossing_detection import check_ma_conditions_for_period
+import logging
+import numpy as np
+from bollinger_bands.indicators.crossing_detection import ma_condition_share_by_period
+from bollinger_bands.utils._njit import njit
 
+logger = logging.getLogger(__name__)
 
-def identify_entry_zones_with_conditions(data, display_data, ma_values, reentry_signals, price_crossing, combined_ma_condition, ma_condition_threshold=0.5, period='daily'):
+
+@njit(cache=True)
+def _zone_kernel(entry_allowed, is_below, reentry):
+    """Single pass zone state machine returning (start_pos, end_pos, completed) arrays"""
+    n = len(entry_allowed)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    completed = np.empty(n, dtype=np.bool_)
+    count = 0
+    in_zone = False
+    zone_start = 0
+    
+    for i in range(n):
+        if entry_allowed[i] and not in_zone:
+            in_zone = True
+            zone_start = i
+        
+        # Crossed back above MA (incomplete zone)
+        if in_zone and not is_below[i]:
+            starts[count] = zone_start
+            ends[count] = i - 1 if i > 0 else i
+            completed[count] = False
+            count += 1
+            in_zone = False
+        
+        # FIRST re-entry signal (completed zone)
+        if in_zone and reentry[i]:
+            starts[count] = zone_start
+            ends[count] = i
+            completed[count] = True
+            count += 1
+            in_zone = False
+    
+    # Still in a zone at the end
+    if in_zone:
+        starts[count] = zone_start
+        ends[count] = n - 1
+        completed[count] = False
+        count += 1
+    
+    return starts[:count], ends[:count], completed[:count]
+
+
+def identify_entry_zones_with_conditions(data, display_data, ma_values, reentry_signals, price_crossing, combined_ma_condition, ma_condition_threshold=0.5, period='daily', is_below=None):
     """
     Identify zones from entry to FIRST re-entry signal.
     
@@ -20,81 +66,49 @@ def identify_entry_zones_with_conditions(data, display_data, ma_values, reentry_
     Entry ends when:
     - FIRST re-entry signal occurs (completed = True), OR
     - Price crosses back above MA (completed = False)
+    
+    Each zone also stores 'start_pos'/'end_pos', the positions of its first
+    and last day in data, so callers can slice with iloc.
+    
+    is_below may be passed as a precomputed boolean array of Close < ma_values.
     """
     zones = []
-    is_below = data['Close'] < ma_values
+    if is_below is None:
+        is_below = (data['Close'] < ma_values).to_numpy()
     
     # Get all crossing dates
-    crossing_dates = display_data.index[price_crossing == 1].tolist()
+    crossing_dates = display_data.index[price_crossing == 1]
     
-    print(f"=== ZONE IDENTIFICATION ({period}) ===")
-    print(f"Valid crossing dates: {len(crossing_dates)}")
+    logger.debug("Zone identification (%s): %d valid crossing dates", period, len(crossing_dates))
     
-    in_zone = False
-    zone_start = None
-    last_crossing_date = None
+    # Index of the last crossing at or before each day (-1 before the first crossing).
+    # Zone exits need no reset: every later day still has that crossing behind it.
+    last_crossing = crossing_dates.searchsorted(data.index, side='right') - 1
     
-    for i in range(len(data)):
-        current_date = data.index[i]
-        
-        # Update last_crossing_date if we passed a crossing
-        for cross_date in crossing_dates:
-            if cross_date <= current_date and (last_crossing_date is None or cross_date > last_crossing_date):
-                last_crossing_date = cross_date
-        
-        # Check MA conditions based on period type
-        if period in ['monthly', 'quarterly']:
-            # For aggregated views, determine which period this date belongs to
-            if period == 'quarterly':
-                # Find the quarter end date for current_date
-                quarter = (current_date.month - 1) // 3 + 1
-                if quarter == 4:
-                    period_end = pd.Timestamp(current_date.year, 12, 31)
-                else:
-                    period_end = pd.Timestamp(current_date.year, quarter * 3, 1) + pd.offsets.MonthEnd(0)
-                period_start = pd.Timestamp(current_date.year, ((current_date.month - 1) // 3) * 3 + 1, 1)
-            else:  # monthly
-                period_start = pd.Timestamp(current_date.year, current_date.month, 1)
-                period_end = period_start + pd.offsets.MonthEnd(0)
-            
-            # Check MA conditions for this period
-            conditions_met, _, _, _ = check_ma_conditions_for_period(
-                period_end, period_start, data, combined_ma_condition, 
-                threshold=ma_condition_threshold
-            )
-        else:
-            # For daily view, check MA conditions on this specific day
-            conditions_met = combined_ma_condition.iloc[i]
-        
-        # Entry condition
-        has_recent_crossing = last_crossing_date is not None
-        
-        if has_recent_crossing and is_below.iloc[i] and conditions_met and not in_zone:
-            in_zone = True
-            zone_start = current_date
-            print(f"  Zone STARTED at {current_date.date()}")
-        
-        # Exit condition 1: Crossed back above MA (incomplete zone)
-        if in_zone and not is_below.iloc[i]:
-            if zone_start is not None:
-                zones.append({'start': zone_start, 'end': data.index[i-1] if i > 0 else current_date, 'completed': False})
-                print(f"  Zone ENDED (incomplete) at {data.index[i-1].date() if i > 0 else current_date.date()}")
-            in_zone = False
-            zone_start = None
-            last_crossing_date = None
-        
-        # Exit condition 2: FIRST re-entry signal (completed zone)
-        if in_zone and reentry_signals.iloc[i]:
-            zones.append({'start': zone_start, 'end': current_date, 'completed': True})
-            print(f"  Zone COMPLETED at {current_date.date()} (re-entry signal)")
-            in_zone = False
-            zone_start = None
-            last_crossing_date = None
+    # Check MA conditions based on period type
+    if period in ['monthly', 'quarterly'] and ma_condition_threshold <= 0:
+        # Every period meets a threshold of 0
+        conditions_met = True
+    elif period in ['monthly', 'quarterly']:
+        conditions_met = ma_condition_share_by_period(data.index, combined_ma_condition, period) >= ma_condition_threshold
+    else:
+        conditions_met = np.asarray(combined_ma_condition, dtype=bool)
+    
+    entry_allowed = (last_crossing >= 0) & is_below & conditions_met
+    reentry = np.asarray(reentry_signals, dtype=bool)
+    
+    starts, ends, completed = _zone_kernel(entry_allowed, is_below, reentry)
+    
+    # Gather all zone boundary dates with one take per side instead of an index lookup per zone
+    start_dates = data.index[starts]
+    end_dates = data.index[ends]
     
-    # Handle case where we're still in a zone at the end
-    if in_zone and zone_start is not None:
-        zones.append({'start': zone_start, 'end': data.index[-1], 'completed': False})
-        print(f"  Zone still OPEN at end: {data.index[-1].date()}")
+    for start, end, start_pos, end_pos, zone_completed in zip(start_dates, end_dates, starts.tolist(), ends.tolist(), completed.tolist()):
+        zones.append({'start': start, 'end': end, 'completed': zone_completed,
+                      'start_pos': start_pos, 'end_pos': end_pos})
     
-    print(f"Total zones identified: {len(zones)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        for zone in zones:
+            logger.debug("  Zone %s to %s (completed=%s)", zone['start'].date(), zone['end'].date(), zone['completed'])
+        logger.debug("Total zones identified: %d", len(zones))
     return zones
@@ -0,0 +1,18 @@
+"""
+Optional Numba Support
+
+This module provides the numba ``njit`` decorator, or a no-op replacement
+when numba is not installed, so compiled kernels also run as plain Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
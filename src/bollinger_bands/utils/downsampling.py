@@ -0,0 +1,39 @@
+"""
+Downsampling Module
+
+This module reduces long line series to the points needed to draw them at screen resolution.
+"""
+
+import numpy as np
+
+
+def m4_indices(values, n_buckets):
+    """
+    Positions kept by M4 downsampling: first, last, minimum and maximum of each bucket.
+    
+    Drawing only these points gives the same line as drawing all of them when
+    each bucket spans about one pixel column.
+    
+    Args:
+        values: 1-D array or Series of values
+        n_buckets: Number of equally sized (by position) buckets
+    
+    Returns:
+        np.ndarray: Sorted positions to keep, all positions if there are at most
+        4 per bucket (NaN values are only kept as first/last points, so gaps remain)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+    
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    bucket_ids = np.repeat(np.arange(n_buckets), np.diff(edges))
+    
+    # Sorting by (bucket, value) puts each bucket's minimum (or maximum) at the bucket start
+    is_nan = np.isnan(values)
+    by_min = np.lexsort((np.where(is_nan, np.inf, values), bucket_ids))
+    by_max = np.lexsort((np.where(is_nan, np.inf, -values), bucket_ids))
+    
+    return np.unique(np.concatenate((starts, edges[1:] - 1, by_min[starts], by_max[starts])))
@@ -0,0 +1,22 @@
+"""
+Run Detection Module
+
+This module handles detection of consecutive runs in boolean series.
+"""
+
+import numpy as np
+
+
+def find_runs(mask):
+    """
+    Find runs of consecutive True values in a boolean array.
+    
+    Args:
+        mask: Boolean array or Series
+        
+    Returns:
+        tuple: (starts, ends) - positional bounds of each run, ends are exclusive
+    """
+    values = np.asarray(mask, dtype=np.int8)
+    edges = np.flatnonzero(np.diff(values, prepend=0, append=0))
+    return edges[0::2], edges[1::2]
@@ -1,9 +1,43 @@
 """
 Formatting Module
 
-This module handles formatting of chart labels for different time periods.
+This module handles formatting of chart labels and x values for different time periods.
 """
 
+import numpy as np
+import pandas as pd
+
+
+def _quarters_and_years(dates):
+    """Quarter (1-4) and year of each date as integer arrays"""
+    dates = pd.DatetimeIndex(dates)
+    return dates.quarter.to_numpy(), dates.year.to_numpy()
+
+
+def _changed(values):
+    """True where a value differs from the previous one (False for the first)"""
+    changed = np.zeros(len(values), dtype=bool)
+    changed[1:] = values[1:] != values[:-1]
+    return changed
+
+
+def _is_first(n):
+    """True for the first of n positions"""
+    first = np.zeros(n, dtype=bool)
+    first[:1] = True
+    return first
+
+
+def _year_tags(years):
+    """Bold year on the bottom line"""
+    return np.char.add(np.char.add('<br><b>', years.astype(str)), '</b>')
+
+
+def _quarter_labels(quarters, years, show_year):
+    """'Q<n>' on the top line and the year (where show_year) on the bottom line"""
+    bottom = np.where(show_year, _year_tags(years), '<br> ')
+    return np.char.add(np.char.add('Q', quarters.astype(str)), bottom)
+
 
 def format_quarter_labels_two_levels(dates):
     """
@@ -14,30 +48,12 @@ def format_quarter_labels_two_levels(dates):
     Q3    Q4         Q1     Q2     Q3    Q4         Q1     Q2     Q3
                 2021                           2022
     """
-    labels = []
-    prev_year = None
+    quarters, years = _quarters_and_years(dates)
     
-    for i, date in enumerate(dates):
-        quarter = (date.month - 1) // 3 + 1
-        year = date.year
-        
-        is_first = prev_year is None
-        is_q1 = quarter == 1
-        year_changed = year != prev_year if prev_year is not None else False
-        
-        if is_first:
-            # First label - show quarter with year below
-            labels.append(f"Q{quarter}<br><b>{year}</b>")
-        elif year_changed and is_q1:
-            # Year changed at Q1 - show year below Q1
-            labels.append(f"Q{quarter}<br><b>{year}</b>")
-        else:
-            # Regular quarter - no year
-            labels.append(f"Q{quarter}<br> ")
-        
-        prev_year = year
+    # Year below the first label and below Q1 whenever the year changed
+    show_year = _is_first(len(quarters)) | (_changed(years) & (quarters == 1))
     
-    return labels
+    return _quarter_labels(quarters, years, show_year).tolist()
 
 
 def format_monthly_labels_as_quarters(dates):
@@ -50,42 +66,22 @@ def format_monthly_labels_as_quarters(dates):
          Q2                Q3                Q4              Q1         Q2
                                                   2021                     2022
     """
-    labels = []
-    prev_year = None
+    quarters, years = _quarters_and_years(dates)
+    months = pd.DatetimeIndex(dates).month.to_numpy()
+    is_first = _is_first(len(months))
+    year_tags = _year_tags(years)
     
-    for i, date in enumerate(dates):
-        quarter = (date.month - 1) // 3 + 1
-        year = date.year
-        month = date.month
-        
-        # Middle months of each quarter: Feb(2), May(5), Aug(8), Nov(11)
-        middle_months = {2: 'Q1', 5: 'Q2', 8: 'Q3', 11: 'Q4'}
-        
-        if month in middle_months:
-            # This is a middle month - show the quarter
-            quarter_label = middle_months[month]
-            
-            is_first = prev_year is None
-            
-            if is_first:
-                # First label - show year
-                labels.append(f"{quarter_label}<br><b>{year}</b>")
-            else:
-                labels.append(f"{quarter_label}<br> ")
-        elif month == 1:
-            # January - show year at year boundary (between Q4 and Q1)
-            year_changed = year != prev_year if prev_year is not None else False
-            if year_changed or prev_year is None:
-                labels.append(f"<br><b>{year}</b>")
-            else:
-                labels.append(" <br> ")
-        else:
-            # Not a middle month and not January - no label
-            labels.append(" <br> ")
-        
-        prev_year = year
+    # Middle months of each quarter: Feb(2), May(5), Aug(8), Nov(11) - show the quarter (and the year if first)
+    middle_labels = np.char.add(np.char.add('Q', quarters.astype(str)), np.where(is_first, year_tags, '<br> '))
     
-    return labels
+    # January - show year at year boundary (between Q4 and Q1)
+    january_labels = np.where(is_first | _changed(years), year_tags, ' <br> ')
+    
+    # Other months - no label
+    labels = np.where(np.isin(months, [2, 5, 8, 11]), middle_labels,
+                      np.where(months == 1, january_labels, ' <br> '))
+    
+    return labels.tolist()
 
 
 def format_daily_labels_simple(dates, max_labels=40):
@@ -93,33 +89,34 @@ def format_daily_labels_simple(dates, max_labels=40):
     Format daily dates with quarters on top line and years on bottom line.
     Simple and fast - shows Q labels at quarter starts.
     """
-    labels = []
-    prev_year = None
-    prev_quarter = None
+    quarters, years = _quarters_and_years(dates)
+    n = len(quarters)
+    is_first = _is_first(n)
+    is_last = np.zeros(n, dtype=bool)
+    is_last[-1:] = True
+    
+    # Only show label if it's a new quarter or first/last point
+    show_label = is_first | is_last | _changed(quarters)
     
-    for i, date in enumerate(dates):
-        year = date.year
-        quarter = (date.month - 1) // 3 + 1
-        
-        # Only show label if it's a new quarter or first/last point
-        is_first = i == 0
-        is_last = i == len(dates) - 1
-        quarter_changed = quarter != prev_quarter if prev_quarter is not None else True
-        
-        if is_first or is_last or quarter_changed:
-            # Show year if it's first label, last label, or year changed
-            year_changed = year != prev_year if prev_year is not None else False
-            is_q4 = quarter == 4
-            
-            if is_first or year_changed or (is_q4 and is_last):
-                labels.append(f"Q{quarter}<br><b>{year}</b>")
-            else:
-                labels.append(f"Q{quarter}<br> ")
-        else:
-            # No label for this date
-            labels.append(" <br> ")
-        
-        prev_year = year
-        prev_quarter = quarter
+    # Show year if it's first label, year changed, or last label in Q4
+    show_year = is_first | _changed(years) | ((quarters == 4) & is_last)
     
-    return labels
+    labels = np.where(show_label, _quarter_labels(quarters, years, show_year), ' <br> ')
+    
+    return labels.tolist()
+
+
+def epoch_ms(dates):
+    """
+    Milliseconds since the epoch of each date.
+    
+    Plotly serializes numbers much faster than datetimes (which become ISO
+    strings), and date axes read numbers as epoch milliseconds.
+    
+    Args:
+        dates: DatetimeIndex or array of dates
+    
+    Returns:
+        np.ndarray: int64 milliseconds
+    """
+    return np.asarray(pd.DatetimeIndex(dates).values.astype('datetime64[ms]').astype(np.int64))
@@ -0,0 +1,43 @@
+"""
+Periods Module
+
+This module aggregates daily data to monthly or quarterly chart points, placed in
+the middle of their period.
+"""
+
+import pandas as pd
+
+
+# Resample rule and days from the period end back to its middle
+_period_rules = {'monthly': ('ME', 15), 'quarterly': ('QE', 45)}
+
+
+def center_in_period(index, period):
+    """Shift period end dates to the middle of their month or quarter"""
+    _, center_offset_days = _period_rules[period]
+    return index - pd.Timedelta(days=center_offset_days)
+
+
+def resample_ohlc(data, period):
+    """
+    Aggregate daily OHLC data to monthly or quarterly candles centered in their period.
+    
+    Args:
+        data: Daily OHLC DataFrame
+        period: 'monthly' or 'quarterly'
+    
+    Returns:
+        DataFrame: One candle per period, with the period end date in 'original_date'
+    """
+    rule, _ = _period_rules[period]
+    display_data = data.resample(rule).agg({'Open':'first','High':'max','Low':'min','Close':'last'}).dropna()
+    display_data['original_date'] = display_data.index
+    display_data.index = center_in_period(display_data.index, period)
+    return display_data
+
+
+def resample_last(values, period):
+    """Last daily value of each month or quarter, at the same centered dates as the candles"""
+    rule, _ = _period_rules[period]
+    period_values = values.resample(rule).last()
+    return period_values.set_axis(center_in_period(period_values.index, period))
@@ -1,7 +1,7 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 import plotly.graph_objects as go
 from typing import Optional
+from bollinger_bands.visualization.formatting import epoch_ms
 
 class Plotter:
     """Handles visualization of financial data and indicators."""
@@ -22,7 +22,7 @@ class Plotter:
     ) -> None:
         """Plots the price chart for the given ticker."""
         self.fig = go.Figure(data=[go.Candlestick(
-            x=data.index,
+            x=epoch_ms(data.index),
             open=data['Open'],
             high=data['High'],
             low=data['Low'],
@@ -43,6 +43,8 @@ class Plotter:
         self.fig.update_layout(
             title=f"{data.attrs['ticker']} Candlestick Chart",
             yaxis_title="Price",
+            # x values are epoch milliseconds
+            xaxis_type='date',
             xaxis_rangeslider_visible=True # False
         )
 
@@ -89,8 +91,9 @@ class Plotter:
         if self.fig is None:
             raise ValueError("Create a plot first using plot_candlestick()")
         
-        self.fig.add_trace(go.Scatter(
-            x=ma_values.index,
+        # WebGL line traces stay fast for long daily series
+        self.fig.add_trace(go.Scattergl(
+            x=epoch_ms(ma_values.index),
             y=ma_values,
             name=name,
             line=dict(color='black', width=2)
@@ -101,15 +104,15 @@ class Plotter:
         if self.fig is None:
             raise ValueError("Create a plot first using plot_candlestick()")
         
-        self.fig.add_trace(go.Scatter(
-            x=bb_values['upper'].index,
+        upper_trace = go.Scattergl(
+            x=epoch_ms(bb_values['upper'].index),
             y=bb_values['upper'],
             name=f'{name_prefix} Upper',
             line=dict(color='blue', 
                       width=1,
                       dash='dash' if dashed else 'solid'),
             opacity=0.5
-        ))
+        )
         
         # self.fig.add_trace(go.Scatter(
         #     x=bb_values['middle'].index,
@@ -119,16 +122,18 @@ class Plotter:
         #     opacity=0.5
         # ))
         
-        self.fig.add_trace(go.Scatter(
-            x=bb_values['lower'].index,
+        lower_trace = go.Scattergl(
+            x=epoch_ms(bb_values['lower'].index),
             y=bb_values['lower'],
             name=f'{name_prefix} Lower',
             line=dict(color='blue', 
                       width=1,
                       dash='dash' if dashed else 'solid'),
             opacity=0.5
-        ))
+        )
         
+        # Both bands in one call
+        self.fig.add_traces([upper_trace, lower_trace])
         return self.fig
 
 
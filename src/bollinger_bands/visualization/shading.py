@@ -0,0 +1,40 @@
+"""
+Shading Module
+
+This module handles building filled areas for chart zones.
+"""
+
+import numpy as np
+
+
+def build_fill_polygons(x, y_top, y_bottom, starts, ends):
+    """
+    Build closed polygons for several segments, separated by gaps.
+    
+    Each segment is outlined along y_top and back along y_bottom, so all
+    segments can be drawn by a single Scatter trace with fill='toself'.
+    
+    Args:
+        x: Index of x values (e.g. DatetimeIndex)
+        y_top: Upper boundary values aligned with x
+        y_bottom: Lower boundary, a scalar or values aligned with x
+        starts: Start positions of the segments
+        ends: End positions of the segments (exclusive)
+        
+    Returns:
+        tuple: (xs, ys) - lists with None separating the segments
+    """
+    y_top = np.asarray(y_top, dtype=float)
+    y_bottom = np.broadcast_to(np.asarray(y_bottom, dtype=float), y_top.shape)
+    
+    xs, ys = [], []
+    for start, end in zip(starts, ends):
+        segment_x = x[start:end].tolist()
+        xs.extend(segment_x)
+        xs.extend(segment_x[::-1])
+        xs.append(None)
+        ys.extend(y_top[start:end].tolist())
+        ys.extend(y_bottom[start:end][::-1].tolist())
+        ys.append(None)
+    
+    return xs, ys
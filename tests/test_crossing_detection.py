@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.indicators.crossing_detection import (
+    _confirmed_crossings_cumsum,
+    _confirmed_crossings_kernel,
+    check_ma_conditions_for_period,
+    detect_price_crossing_down_daily,
+    ma_condition_share_in_windows,
+    ma_condition_share_by_period
+)
+
+def _daily_condition():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range('2020-01-01', '2021-12-31')
+    data = pd.DataFrame({'Close': rng.normal(size=len(index))}, index=index)
+    return data, pd.Series(rng.random(len(index)) < 0.4, index=index)
+
+def test_ma_condition_share_matches_period_check():
+    data, condition = _daily_condition()
+    period_ends = pd.date_range('2020-01-31', '2021-12-31', freq='ME')
+    share = ma_condition_share_by_period(data.index, condition, 'monthly', dates=period_ends)
+    for period_end, period_share in zip(period_ends, share):
+        period_start = pd.Timestamp(period_end.year, period_end.month, 1)
+        _, expected, _, _ = check_ma_conditions_for_period(period_end, period_start, data, condition)
+        assert period_share == expected
+
+def test_ma_condition_share_per_day_is_constant_within_quarter():
+    data, condition = _daily_condition()
+    share = pd.Series(ma_condition_share_by_period(data.index, condition, 'quarterly'), index=data.index)
+    assert (share.groupby(data.index.to_period('Q')).nunique() == 1).all()
+    np.testing.assert_allclose(share.groupby(data.index.to_period('Q')).first(),
+                               condition.groupby(data.index.to_period('Q')).mean())
+
+def test_ma_condition_share_is_nan_without_trading_days():
+    data, condition = _daily_condition()
+    share = ma_condition_share_by_period(data.index, condition, 'monthly',
+                                         dates=pd.DatetimeIndex(['2019-06-30', '2022-03-31']))
+    assert np.isnan(share).all()
+
+def test_ma_condition_share_in_windows_matches_period_check():
+    data, condition = _daily_condition()
+    starts = pd.DatetimeIndex(['2020-01-01', '2020-03-07', '2020-06-15', '2021-12-30', '2022-01-03'])
+    ends = starts + pd.Timedelta(days=10)
+    share, total_days = ma_condition_share_in_windows(data.index, condition, starts, ends)
+    for start, end, window_share, window_days in zip(starts, ends, share, total_days):
+        _, expected, _, expected_days = check_ma_conditions_for_period(end, start, data, condition)
+        assert window_days == expected_days
+        assert window_share == expected
+
+def test_detect_price_crossing_down_daily_requires_confirmation():
+    index = pd.bdate_range('2021-01-04', periods=30)
+    # Dip below the MA for two days, then a lasting move below it
+    close = np.r_[np.full(10, 12.0), [8.0, 8.0], np.full(8, 12.0), np.full(10, 8.0)]
+    data = pd.DataFrame({'Close': close}, index=index)
+    ma = pd.Series(10.0, index=index)
+    crossing = detect_price_crossing_down_daily(data, ma, smoothing_window=1)
+    assert crossing.index.equals(index)
+    assert crossing.dtype == np.int8
+    assert index[crossing == 1].tolist() == [index[10], index[20]]
+    crossing = detect_price_crossing_down_daily(data, ma, smoothing_window=5)
+    assert index[crossing == 1].tolist() == [index[22]]
+
+def test_confirmed_crossings_cumsum_matches_kernel():
+    rng = np.random.default_rng(1)
+    is_below = np.repeat(rng.random(300) < 0.5, rng.integers(1, 8, 300))
+    for smoothing_window in [1, 3, 5, 10]:
+        expected = _confirmed_crossings_kernel(is_below, smoothing_window)
+        np.testing.assert_array_equal(_confirmed_crossings_cumsum(is_below, smoothing_window), expected)
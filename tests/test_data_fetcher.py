@@ -16,3 +16,87 @@ def test_resample_to_monthly_empty_data():
     fetcher = DataFetcher()
     with pytest.raises(ValueError):
         fetcher.resample_to_monthly(pd.DataFrame())
+
+def test_fetch_ohlc_data_batch_empty_tickers():
+    fetcher = DataFetcher()
+    with pytest.raises(ValueError):
+        fetcher.fetch_ohlc_data_batch([], '2020-01-01', '2020-02-01')
+
+def test_fetch_ohlc_data_reads_parquet_cache(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    index = pd.bdate_range('2020-01-01', periods=3)
+    cached = pd.DataFrame({'Open': [1.0, 2.0, 3.0], 'High': [1.5, 2.5, 3.5],
+                           'Low': [0.5, 1.5, 2.5], 'Close': [1.2, 2.2, 3.2]}, index=index)
+    fetcher = DataFetcher(cache_dir=tmp_path)
+    fetcher._write_cache(cached, 'SPY', '2020-01-01', '2020-02-01')
+    def fail_download(*args, **kwargs):
+        raise AssertionError("cached data must not be downloaded")
+    monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', fail_download)
+    result = fetcher.fetch_ohlc_data('SPY', '2020-01-01', '2020-02-01')
+    pd.testing.assert_frame_equal(result, cached, check_freq=False)
+    assert result.attrs['ticker'] == 'SPY'
+    assert fetcher.fetch_ohlc_data_batch(['SPY'], '2020-01-01', '2020-02-01')['SPY'].attrs['ticker'] == 'SPY'
+
+def test_fetch_daily_data_returns_close_per_ticker(monkeypatch):
+    index = pd.bdate_range('2020-01-01', periods=2)
+    columns = pd.MultiIndex.from_product([['Close', 'Open'], ['SPY', 'QQQ']], names=['Price', 'Ticker'])
+    downloaded = pd.DataFrame([[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]], index=index, columns=columns)
+    monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', lambda *args, **kwargs: downloaded)
+    result = DataFetcher().fetch_daily_data(['SPY', 'QQQ'], '2020-01-01', '2020-02-01')
+    assert result.columns.tolist() == ['SPY', 'QQQ']
+    assert result['QQQ'].tolist() == [2.0, 6.0]
+    flat = downloaded['Close'][['SPY']].rename(columns={'SPY': 'Close'})
+    monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', lambda *args, **kwargs: flat)
+    assert DataFetcher().fetch_daily_data(['SPY'], '2020-01-01', '2020-02-01').columns.tolist() == ['SPY']
+
+def test_resample_to_monthly_last_close_per_month():
+    index = pd.bdate_range('2020-01-01', '2020-06-30')
+    daily_data = pd.DataFrame({'SPY': range(len(index))}, index=index, dtype=float)
+    expected = daily_data.resample('ME').last()
+    pd.testing.assert_frame_equal(DataFetcher().resample_to_monthly(daily_data), expected, check_freq=False)
+
+def test_parquet_cache_is_keyed_by_ticker_and_start_date(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    index = pd.bdate_range('2020-01-01', periods=3)
+    cached = pd.DataFrame({'Open': [1.0, 2.0, 3.0], 'High': [1.5, 2.5, 3.5],
+                           'Low': [0.5, 1.5, 2.5], 'Close': [1.2, 2.2, 3.2]}, index=index)
+    (tmp_path / 'SPY_2020-01-01_2019-12-31.parquet').write_bytes(b'')
+    fetcher = DataFetcher(cache_dir=tmp_path)
+    fetcher._write_cache(cached, 'SPY', '2020-01-01', '2020-02-01')
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['SPY_2020-01-01.parquet']
+    assert len(fetcher._read_cache('SPY', '2020-01-01', '2020-01-03')) == 2
+    assert fetcher._read_cache('SPY', '2020-01-01', '2020-03-01') is None
+
+def _download_by_ticker(tickers, index):
+    fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+    columns = pd.MultiIndex.from_product([tickers, fields], names=['Ticker', 'Price'])
+    values = [[float(row * 10 + col) for col in range(len(columns))] for row in range(len(index))]
+    return pd.DataFrame(values, index=index, columns=columns)
+
+def test_fetch_ohlc_data_batch_splits_download_by_ticker(monkeypatch):
+    index = pd.bdate_range('2020-01-01', periods=3)
+    downloaded = _download_by_ticker(['SPY', 'QQQ'], index)
+    downloaded.loc[index[0], 'QQQ'] = float('nan')
+    monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', lambda *args, **kwargs: downloaded)
+    result = DataFetcher().fetch_ohlc_data_batch(['SPY', 'QQQ'], '2020-01-01', '2020-02-01')
+    assert list(result) == ['SPY', 'QQQ']
+    pd.testing.assert_frame_equal(result['SPY'], downloaded['SPY'][['Open', 'High', 'Low', 'Close']])
+    assert result['QQQ'].index.equals(index[1:])
+    assert result['QQQ'].columns.tolist() == ['Open', 'High', 'Low', 'Close']
+    assert result['QQQ'].attrs['ticker'] == 'QQQ'
+
+def test_fetch_ohlc_data_batch_single_ticker(monkeypatch):
+    index = pd.bdate_range('2020-01-01', periods=3)
+    downloaded = _download_by_ticker(['SPY'], index)
+    for columns in [downloaded, downloaded['SPY']]:
+        monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', lambda *args, columns=columns, **kwargs: columns)
+        result = DataFetcher().fetch_ohlc_data_batch(['SPY'], '2020-01-01', '2020-02-01')
+        pd.testing.assert_frame_equal(result['SPY'], downloaded['SPY'][['Open', 'High', 'Low', 'Close']])
+
+def test_fetch_ohlc_data_batch_ticker_without_data(monkeypatch):
+    index = pd.bdate_range('2020-01-01', periods=3)
+    downloaded = _download_by_ticker(['SPY', 'INVALID_TICKER'], index)
+    downloaded.loc[:, 'INVALID_TICKER'] = float('nan')
+    monkeypatch.setattr('bollinger_bands.data.fetcher.yf.download', lambda *args, **kwargs: downloaded)
+    with pytest.raises(RuntimeError, match='INVALID_TICKER'):
+        DataFetcher().fetch_ohlc_data_batch(['SPY', 'INVALID_TICKER'], '2020-01-01', '2020-02-01')
@@ -0,0 +1,19 @@
+import numpy as np
+from bollinger_bands.utils.downsampling import m4_indices
+
+def test_m4_indices_keeps_bucket_extremes():
+    values = np.array([3.0, 1.0, 5.0, 2.0, 4.0, 0.0, 9.0, 7.0, 8.0, 6.0])
+    keep = m4_indices(values, 2)
+    # Buckets [0, 5) and [5, 10): first, last, min and max of each
+    assert keep.tolist() == [0, 1, 2, 4, 5, 6, 9]
+
+def test_m4_indices_short_input_is_unchanged():
+    assert m4_indices(np.arange(8.0), 2).tolist() == list(range(8))
+
+def test_m4_indices_ignores_nan_for_extremes():
+    values = np.r_[np.full(10, np.nan), np.sin(np.arange(990) / 50.0)]
+    keep = m4_indices(values, 100)
+    assert len(keep) <= 400
+    assert values[keep[0]] != values[keep[0]]
+    assert np.nanmax(values[keep]) == np.nanmax(values)
+    assert np.nanmin(values[keep]) == np.nanmin(values)
@@ -0,0 +1,32 @@
+import pandas as pd
+from bollinger_bands.visualization.formatting import (
+    epoch_ms, format_daily_labels_simple, format_monthly_labels_as_quarters, format_quarter_labels_two_levels
+)
+
+def test_format_quarter_labels_two_levels():
+    dates = pd.date_range('2021-07-01', periods=5, freq='QS')
+    assert format_quarter_labels_two_levels(dates) == [
+        'Q3<br><b>2021</b>', 'Q4<br> ', 'Q1<br><b>2022</b>', 'Q2<br> ', 'Q3<br> '
+    ]
+
+def test_format_monthly_labels_as_quarters():
+    dates = pd.date_range('2021-11-01', periods=5, freq='MS')
+    assert format_monthly_labels_as_quarters(dates) == [
+        'Q4<br><b>2021</b>', ' <br> ', '<br><b>2022</b>', 'Q1<br> ', ' <br> '
+    ]
+
+def test_format_daily_labels_simple():
+    dates = pd.DatetimeIndex(['2021-09-29', '2021-09-30', '2021-10-01', '2021-12-31', '2022-01-03', '2022-01-04'])
+    assert format_daily_labels_simple(dates) == [
+        'Q3<br><b>2021</b>', ' <br> ', 'Q4<br> ', ' <br> ', 'Q1<br><b>2022</b>', 'Q1<br> '
+    ]
+
+def test_format_labels_empty():
+    dates = pd.DatetimeIndex([])
+    assert format_quarter_labels_two_levels(dates) == []
+    assert format_monthly_labels_as_quarters(dates) == []
+    assert format_daily_labels_simple(dates) == []
+
+def test_epoch_ms():
+    dates = pd.DatetimeIndex(['1970-01-01', '1970-01-02', '2021-03-31'])
+    assert epoch_ms(dates).tolist() == [0, 86400000, int(pd.Timestamp('2021-03-31').timestamp() * 1000)]
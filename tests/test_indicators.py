@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from bollinger_bands.indicators.moving_average import MovingAverage
+from bollinger_bands.indicators.bollinger_bands import BollingerBands
+from bollinger_bands.indicators.band_width import BandWidth
+from bollinger_bands.indicators._kernels import (
+    _rolling_mean_std_kernel, _rolling_mean_std_polars, _rolling_mean_std_windows, rolling_mean_std
+)
+
+def _prices(dtype):
+    rng = np.random.default_rng(0)
+    close = 50 + np.cumsum(rng.normal(0, 0.5, 2000))
+    index = pd.bdate_range('2015-01-01', periods=len(close))
+    return pd.DataFrame({'Close': close}, index=index).astype(dtype)
+
+def test_moving_average_float32_parity():
+    ma = MovingAverage(window=420)
+    expected = ma.calculate(_prices(np.float64))
+    result = ma.calculate(_prices(np.float32))
+    np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+def test_bollinger_bands_float32_parity():
+    bb = BollingerBands(window=420, num_std=2)
+    expected = bb.calculate(_prices(np.float64))
+    result = bb.calculate(_prices(np.float32))
+    for key in ['upper', 'middle', 'lower']:
+        np.testing.assert_allclose(result[key], expected[key], rtol=1e-5)
+    np.testing.assert_allclose(BandWidth(window=420).calculate(result),
+                               BandWidth(window=420).calculate(expected), rtol=1e-4)
+
+def test_bollinger_bands_matches_pandas_rolling():
+    data = _prices(np.float64)
+    data.iloc[700, 0] = np.nan
+    bb = BollingerBands(window=420, num_std=2).calculate(data)
+    sma = data['Close'].rolling(window=420).mean()
+    std = data['Close'].rolling(window=420).std()
+    np.testing.assert_allclose(bb['middle'], sma, rtol=1e-9)
+    np.testing.assert_allclose(bb['upper'], sma + 2 * std, rtol=1e-9)
+    np.testing.assert_allclose(bb['lower'], sma - 2 * std, rtol=1e-9)
+    assert bb['middle'].index.equals(data.index)
+
+def test_bollinger_bands_constant_prices_have_zero_width():
+    data = pd.DataFrame({'Close': np.full(30, 10.0)}, index=pd.bdate_range('2021-01-04', periods=30))
+    bb = BollingerBands(window=20, num_std=2).calculate(data)
+    assert bb['upper'].isna().sum() == 19
+    assert (bb['upper'].dropna() == 10.0).all() and (bb['lower'].dropna() == 10.0).all()
+
+def test_rolling_mean_std_fallback_matches_kernel():
+    values = _prices(np.float64)['Close'].to_numpy().copy()
+    values[300] = np.nan
+    for window in [1, 2, 20, 420, 5000]:
+        expected = _rolling_mean_std_kernel(values, window)
+        result = _rolling_mean_std_windows(values, window)
+        for result_values, expected_values in zip(result, expected):
+            np.testing.assert_allclose(result_values, expected_values, rtol=1e-9, atol=1e-7)
+
+def test_bollinger_bands_calculate_multi_matches_calculate():
+    data = _prices(np.float64)
+    bands = BollingerBands(num_std=2).calculate_multi(data, [840, 420])
+    for window in [840, 420]:
+        expected = BollingerBands(window=window, num_std=2).calculate(data)
+        for key in ['upper', 'middle', 'lower']:
+            pd.testing.assert_series_equal(bands[window][key], expected[key])
+
+def test_band_width_from_prices_matches_bands():
+    data = _prices(np.float64)
+    expected = BandWidth(window=420).calculate(BollingerBands(window=420).calculate(data))
+    pd.testing.assert_series_equal(BandWidth(window=420).calculate(data), expected)
+
+def test_rolling_mean_std_polars_matches_fallback():
+    pytest.importorskip('polars')
+    values = _prices(np.float64)['Close'].to_numpy().copy()
+    values[300] = np.nan
+    windows = [1, 2, 420, 5000]
+    for window, result in zip(windows, _rolling_mean_std_polars(values, windows)):
+        expected = _rolling_mean_std_windows(values, window)
+        for result_values, expected_values in zip(result, expected):
+            np.testing.assert_allclose(result_values, expected_values, rtol=1e-9, atol=1e-7)
+
+def test_rolling_mean_std_reads_float32_without_precision_loss():
+    values = _prices(np.float32)['Close'].to_numpy()
+    expected = rolling_mean_std(values.astype(np.float64), 420)
+    result = rolling_mean_std(values, 420)
+    assert result[0].dtype == np.float64
+    for result_values, expected_values in zip(result, expected):
+        np.testing.assert_allclose(result_values, expected_values, rtol=1e-12)
+
+def test_moving_average_matches_bollinger_middle_band():
+    data = _prices(np.float64)
+    data.iloc[700, 0] = np.nan
+    result = MovingAverage(window=420).calculate(data)
+    pd.testing.assert_series_equal(result, BollingerBands(window=420).calculate(data)['middle'])
+    np.testing.assert_allclose(result, data['Close'].rolling(window=420).mean(), rtol=1e-9)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.visualization.periods import resample_last, resample_ohlc
+
+def _daily_ohlc():
+    index = pd.bdate_range('2020-01-01', '2021-12-31')
+    close = np.linspace(10.0, 20.0, len(index))
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close}, index=index)
+
+def test_resample_last_lines_up_with_candles():
+    data = _daily_ohlc()
+    for period in ['monthly', 'quarterly']:
+        candles = resample_ohlc(data, period)
+        line = resample_last(data['Close'], period)
+        assert line.index.equals(candles.index)
+        np.testing.assert_array_equal(line.to_numpy(), candles['Close'].to_numpy())
+
+def test_resample_ohlc_centers_candles_in_period():
+    candles = resample_ohlc(_daily_ohlc(), 'quarterly')
+    assert candles.index[0] == pd.Timestamp('2020-03-31') - pd.Timedelta(days=45)
+    assert candles['original_date'].iloc[0] == pd.Timestamp('2020-03-31')
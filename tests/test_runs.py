@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.utils.runs import find_runs
+
+def test_find_runs_bounds():
+    starts, ends = find_runs(np.array([True, True, False, True, False, False, True]))
+    assert starts.tolist() == [0, 3, 6]
+    assert ends.tolist() == [2, 4, 7]
+
+def test_find_runs_no_runs():
+    starts, ends = find_runs(np.zeros(5, dtype=bool))
+    assert len(starts) == 0 and len(ends) == 0
+
+def test_find_runs_empty_input():
+    starts, ends = find_runs(np.array([], dtype=bool))
+    assert len(starts) == 0 and len(ends) == 0
+
+def test_find_runs_accepts_series():
+    mask = pd.Series([False, True, True, True], index=pd.date_range('2020-01-01', periods=4))
+    starts, ends = find_runs(mask)
+    assert starts.tolist() == [1]
+    assert ends.tolist() == [4]
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.visualization.shading import build_fill_polygons
+
+def test_build_fill_polygons_single_segment():
+    x = pd.Index([10, 11, 12, 13])
+    xs, ys = build_fill_polygons(x, [4.0, 5.0, 6.0, 7.0], 1.0, [1], [3])
+    assert xs == [11, 12, 12, 11, None]
+    assert ys == [5.0, 6.0, 1.0, 1.0, None]
+
+def test_build_fill_polygons_segments_separated_by_gaps():
+    x = pd.Index([0, 1, 2, 3, 4])
+    y_top = np.array([5.0, 6.0, 7.0, 8.0, 9.0])
+    y_bottom = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    xs, ys = build_fill_polygons(x, y_top, y_bottom, [0, 3], [2, 5])
+    assert xs == [0, 1, 1, 0, None, 3, 4, 4, 3, None]
+    assert ys == [5.0, 6.0, 1.0, 0.0, None, 8.0, 9.0, 4.0, 3.0, None]
+
+def test_build_fill_polygons_no_segments():
+    xs, ys = build_fill_polygons(pd.Index([0, 1]), [1.0, 2.0], 0.0, [], [])
+    assert xs == [] and ys == []
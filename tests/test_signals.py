@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.indicators.signals import (
+    detect_bullish_engulfing, detect_candlestick_patterns, detect_hammer, detect_morning_star
+)
+
+def _candles(open_prices, close_prices, high_prices=None, low_prices=None):
+    open_prices = np.asarray(open_prices, dtype=float)
+    close_prices = np.asarray(close_prices, dtype=float)
+    if high_prices is None:
+        high_prices = np.maximum(open_prices, close_prices)
+    if low_prices is None:
+        low_prices = np.minimum(open_prices, close_prices)
+    index = pd.bdate_range('2021-01-04', periods=len(open_prices))
+    return pd.DataFrame({'Open': open_prices, 'High': high_prices, 'Low': low_prices, 'Close': close_prices}, index=index)
+
+def test_detect_bullish_engulfing():
+    # Bearish candle followed by a bullish candle covering its body, then a non-engulfing bullish candle
+    data = _candles([10, 8.5, 11, 10], [9, 10.5, 12, 9.5])
+    result = detect_bullish_engulfing(data)
+    assert result.index.equals(data.index)
+    assert result.tolist() == [False, True, False, False]
+
+def test_detect_bullish_engulfing_short_input():
+    assert detect_bullish_engulfing(_candles([10], [9])).tolist() == [False]
+    assert detect_bullish_engulfing(_candles([], [])).empty
+
+def test_detect_hammer():
+    # Hammer, inverted hammer, candle without range, ordinary candle
+    data = _candles([10, 10, 10, 10], [10.5, 10.5, 10, 11],
+                    high_prices=[10.6, 12, 10, 11.2], low_prices=[8, 9.95, 10, 9.8])
+    assert detect_hammer(data).tolist() == [True, True, False, False]
+
+def test_detect_morning_star():
+    data = _candles([12, 9.8, 10, 11.6, 11], [10, 9.9, 11.5, 11.0, 11.2])
+    assert detect_morning_star(data).tolist() == [False, False, True, False, False]
+
+def test_detect_morning_star_requires_recovery():
+    # Third candle closes below the midpoint of the first candle's body
+    data = _candles([12, 9.8, 10], [10, 9.9, 10.8])
+    assert not detect_morning_star(data).any()
+
+def test_detect_candlestick_patterns_matches_detectors():
+    data = _candles([12, 9.8, 10, 11.6, 11, 10], [10, 9.9, 11.5, 11.0, 11.2, 10.5],
+                    high_prices=[12, 10, 11.5, 11.6, 12.5, 10.6], low_prices=[9.5, 9.7, 10, 10.9, 10.9, 8]).astype(np.float32)
+    patterns = detect_candlestick_patterns(data)
+    assert patterns['engulfing'].equals(detect_bullish_engulfing(data))
+    assert patterns['hammer'].equals(detect_hammer(data))
+    assert patterns['morning_star'].equals(detect_morning_star(data))
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from bollinger_bands.strategies.zones import _zone_kernel, identify_entry_zones_with_conditions
+
+def test_zone_kernel_transitions():
+    entry_allowed = np.array([False, True, True, False, True, True, False, True])
+    is_below = np.array([False, True, True, False, True, True, True, True])
+    reentry = np.array([False, False, False, False, False, True, False, False])
+    starts, ends, completed = _zone_kernel(entry_allowed, is_below, reentry)
+    # Exit above MA ends the zone the day before, a re-entry signal ends it on the same day
+    assert starts.tolist() == [1, 4, 7]
+    assert ends.tolist() == [2, 5, 7]
+    assert completed.tolist() == [False, True, False]
+
+def test_zone_kernel_no_entries():
+    starts, ends, completed = _zone_kernel(np.zeros(4, dtype=bool), np.ones(4, dtype=bool), np.zeros(4, dtype=bool))
+    assert len(starts) == len(ends) == len(completed) == 0
+
+def test_identify_entry_zones_waits_for_first_crossing():
+    index = pd.bdate_range('2021-01-04', periods=8)
+    data = pd.DataFrame({'Close': [10.0, 8, 8, 8, 12, 8, 8, 12]}, index=index)
+    ma_values = pd.Series(9.0, index=index)
+    price_crossing = pd.Series([0, 0, 1, 0, 0, 0, 0, 0], index=index)
+    reentry = pd.Series([False] * 6 + [True, False], index=index)
+    condition = pd.Series(True, index=index)
+    zones = identify_entry_zones_with_conditions(data, data, ma_values, reentry, price_crossing, condition)
+    assert [(z['start_pos'], z['end_pos'], z['completed']) for z in zones] == [(2, 3, False), (5, 6, True)]
+    assert zones[0]['start'] == index[2] and zones[1]['end'] == index[6]
+
+def test_identify_entry_zones_uses_monthly_condition_share():
+    index = pd.bdate_range('2021-01-01', '2021-02-26')
+    data = pd.DataFrame({'Close': 8.0}, index=index)
+    ma_values = pd.Series(9.0, index=index)
+    price_crossing = pd.Series(0, index=index)
+    price_crossing.iloc[0] = 1
+    reentry = pd.Series(False, index=index)
+    # Conditions hold on a single January day only, but on every February day
+    condition = pd.Series(index.month == 2, index=index)
+    condition.iloc[0] = True
+    zones = identify_entry_zones_with_conditions(data, data, ma_values, reentry, price_crossing, condition,
+                                                 ma_condition_threshold=0.5, period='monthly')
+    assert [(z['start'], z['end'], z['completed']) for z in zones] == [(pd.Timestamp('2021-02-01'), index[-1], False)]